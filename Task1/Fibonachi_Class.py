@@ -1,20 +1,100 @@
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, repeat
+from operator import add
+
+try:  # Imported from the repository root, e.g. `import Task1.Fibonachi_Class`
+    from .Fibonaci_Method import fibonaci_array, fibonaci_iter, nth, nth_mod
+except ImportError:  # Run as a script, or imported with Task1/ on sys.path
+    from Fibonaci_Method import fibonaci_array, fibonaci_iter, nth, nth_mod
+
+
 class fibo:
-    # time complexity is n
+    # Terms computed so far, shared by every instance in the process: F(0) .. F(len - 1). Requests
+    # inside it are answered by slicing, longer ones extend it from its last two terms. The new terms
+    # are computed outside the lock, so hits are never blocked by another thread's extension. It is
+    # capped at max_cache_bytes (terms plus list slots); terms past the cap are returned but not kept.
+    _cache = [0, 1]
+    _cache_bytes = 2 * (sys.getsizeof(1) + 8)
+    _cache_lock = threading.Lock()
+    _stats = {'hits': 0, 'extends': 0, 'extended_terms': 0, 'uncached_terms': 0, 'evicted_terms': 0}
+    max_cache_bytes = 64 << 20  # About 37,000 terms
+
+    # time complexity is n for the first call (only the new terms after that), space complexity is n
     def fibonaci(self,number):
-        list=[] # space complexity is n
-        if number <= 0:
-            list.append(0)
-        elif number == 1:
-            list.append(0)
-            list.append(1)
-        else:
-            list.append(0)
-            list.append(1)
-            a, b = 0, 1
-            for _ in range(2, number):
-                a, b = b, a + b
-                list.append(b)
-        return list   
+        count = 1 if number <= 0 else max(number, 2)  # fibonaci(1) has always returned [0, 1]
+        with fibo._cache_lock:
+            cache = fibo._cache
+            if count <= len(cache):
+                fibo._stats['hits'] += 1
+                return cache[:count]
+            list = cache[:]
+        before = len(list)
+        a, b = list[-2], list[-1]
+        for _ in range(count - before):
+            a, b = b, a + b
+            list.append(b)
+        # Bytes the cache grows by when it keeps the first k new terms, for k = 1 .. count - before
+        growth = array('q', accumulate(map(add, map(sys.getsizeof, list[before:]), repeat(8))))
+
+        with fibo._cache_lock:
+            fibo._stats['extends'] += 1
+            cache = fibo._cache
+            if len(cache) >= before:  # Otherwise it was cleared meanwhile, and the new terms no longer follow on
+                # Another thread may have extended it meanwhile: only add what is still missing, up to the cap
+                start = min(len(cache), count) - before
+                room = fibo.max_cache_bytes - fibo._cache_bytes + (growth[start - 1] if start else 0)
+                keep = max(bisect_right(growth, room), start)
+                cache.extend(list[len(cache):before + keep])
+                fibo._cache_bytes += (growth[keep - 1] if keep else 0) - (growth[start - 1] if start else 0)
+                fibo._stats['extended_terms'] += keep - start
+            fibo._stats['uncached_terms'] += max(count - len(cache), 0)
+        return list
+
+    # Changes the cap; a smaller cap evicts the largest (last) terms until the cache fits
+    @classmethod
+    def set_cache_limit(cls, max_bytes):
+        with cls._cache_lock:
+            cls.max_cache_bytes = max_bytes
+            while len(cls._cache) > 2 and cls._cache_bytes > max_bytes:
+                cls._cache_bytes -= sys.getsizeof(cls._cache.pop()) + 8
+                cls._stats['evicted_terms'] += 1
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._stats['evicted_terms'] += len(cls._cache) - 2
+            del cls._cache[2:]
+            cls._cache_bytes = 2 * (sys.getsizeof(1) + 8)
+
+    @classmethod
+    def cache_stats(cls):
+        with cls._cache_lock:
+            return {
+                'terms': len(cls._cache),
+                'bytes': cls._cache_bytes,
+                'max_bytes': cls.max_cache_bytes,
+                **cls._stats,
+            }
+
+    # Lazy version of fibonaci(): yields F(start) .. F(stop-1) one at a time, keeping only two terms
+    # time complexity is log(start) + (stop - start), space complexity is 1
+    def fibonaci_iter(self, start=0, stop=None):
+        return fibonaci_iter(start, stop)
+
+    # Same terms as a NumPy array: int64/uint64 up to F(93), float64 up to F(1476), then object
+    def fibonaci_array(self, number, dtype=None):
+        return fibonaci_array(number, dtype)
+
+    # Only F(n), by fast doubling: time complexity is log n multiplications, space complexity is 1
+    def nth(self, n):
+        return nth(n)
+
+    # F(n) mod m, with n reduced by the Pisano period of m first
+    def nth_mod(self, n, m):
+        return nth_mod(n, m)
 
         
     # def fiboseries(self,n):
@@ -28,4 +108,5 @@ if __name__=="__main__":
     f=fibo()
     number=int(input("Enter the number:"))
     result=f.fibonaci(number)
-    print(result)
\ No newline at end of file
+    print(result)
+    print(f"F({number}) =", f.nth(max(number, 0)))  # time complexity is log n
@@ -1,3 +1,15 @@
+import sys
+from functools import lru_cache
+from math import lcm
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only needed for fibonaci_array()
+    np = None
+
+PISANO_LIMIT = 10**12  # Largest modulus whose Pisano period is worked out (trial division up to 10**6)
+
+
   # time complexity is n
 def fibonaci(number):
     list=[] # space complexity is n
@@ -14,7 +26,192 @@ def fibonaci(number):
             a, b = b, a + b
             list.append(b)
     return list   
-        
-        
-number=int(input("Enter the number:"))
-print(fibonaci(number))    
\ No newline at end of file
+
+
+# (F(n), F(n+1)) by fast doubling, reduced modulo `mod` when given:
+#   F(2k)   = F(k) * (2*F(k+1) - F(k))
+#   F(2k+1) = F(k)^2 + F(k+1)^2
+# time complexity is log n multiplications, space complexity is 1 (apart from the big integers)
+def fib_pair(n, mod=None):
+    a, b = 0, 1
+    for bit in bin(n)[2:]:  # Most significant bit first: (F(k), F(k+1)) -> (F(2k), F(2k+1)) [+1]
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if mod:
+            c %= mod
+            d %= mod
+        a, b = (d, c + d) if bit == '1' else (c, d)
+    return (a % mod, b % mod) if mod else (a, b)
+
+
+# Terms F(start), F(start+1), ... up to F(stop-1) (endless when stop is None), one at a time, like
+# islice(series, start, stop). The first two terms come from fast doubling, so a late start costs
+# log(start) multiplications instead of start additions.
+# time complexity is 1 addition per term, space complexity is 1 (only the last two terms are kept)
+def fibonaci_iter(start=0, stop=None):
+    if start < 0 or (stop is not None and stop < 0):
+        raise ValueError("start and stop must be non-negative")
+    a, b = fib_pair(start)
+    n = start
+    while stop is None or n < stop:
+        yield a
+        a, b = b, a + b
+        n += 1
+
+
+# Writes F(start) .. F(stop-1), one per line, through a large output buffer instead of a write per term
+def stream(start=0, stop=None, out=None, buffer_size=1 << 20):
+    sys.set_int_max_str_digits(0)  # Terms past F(20577) have more digits than str() allows by default
+    out = out or open(sys.stdout.fileno(), 'w', buffering=buffer_size, closefd=False)
+    try:
+        for term in fibonaci_iter(start, stop):
+            out.write(f"{term}\n")
+        out.flush()
+    except BrokenPipeError:  # e.g. piped into head
+        pass
+
+
+# Largest index each fixed-width dtype can hold: F(92) < 2**63 <= F(93) < 2**64, and F(1477) overflows
+# float64 to inf
+ARRAY_LIMITS = {'int64': 92, 'uint64': 93, 'float64': 1476}
+
+
+# The terms of fibonaci(number) as a NumPy array. By default the narrowest exact dtype is used: int64
+# up to F(92), uint64 for F(93), then float64 up to F(1476), then object (Python ints). float64 is
+# exact up to F(78) (2**53); past that values are rounded to about 15-16 significant digits.
+# Fixed-width results are copied from a table of every term the dtype can hold (12 KB at most for
+# float64), built once per dtype, so no Python int is created per term.
+# time complexity is n (one copy), space complexity is n machine words
+def fibonaci_array(number, dtype=None):
+    if np is None:
+        raise ImportError("fibonaci_array() needs numpy")
+    count = 1 if number <= 0 else max(number, 2)  # Same terms as fibonaci(number)
+    last = count - 1
+    if dtype is None:
+        dtype = next((name for name, limit in ARRAY_LIMITS.items() if last <= limit), 'object')
+    dtype = np.dtype(dtype)
+    if dtype == object:
+        return np.fromiter(fibonaci_iter(0, count), dtype=object, count=count)
+    if dtype.name not in ARRAY_LIMITS:
+        raise ValueError(f"dtype must be one of {', '.join(ARRAY_LIMITS)} or object")
+    if last > ARRAY_LIMITS[dtype.name]:
+        raise OverflowError(f"F({last}) does not fit in {dtype.name}")
+    return fibonaci_table(dtype.name)[:count].copy()
+
+
+# F(0) .. F(ARRAY_LIMITS[dtype]) filled in vectorized blocks with F(m+j) = F(m)*F(j+1) + F(m-1)*F(j):
+# the filled part roughly doubles with each step. Every product is at most F(m+j), so nothing
+# overflows. The table is read-only, fibonaci_array() hands out copies.
+@lru_cache(maxsize=None)
+def fibonaci_table(dtype):
+    count = ARRAY_LIMITS[dtype] + 1
+    out = np.empty(count, dtype)
+    out[:3] = [0, 1, 1]
+    known = 3  # out[:known] holds F(0) .. F(known - 1)
+    while known < count:
+        m = known - 1
+        step = min(m - 1, count - known)  # F(j+1) must already be known for every j <= step
+        out[known:known + step] = out[m] * out[2:step + 2] + out[m - 1] * out[1:step + 1]
+        known += step
+    out.flags.writeable = False
+    return out
+
+
+# F(n) only, without building the list. F(0) = 0, F(1) = 1
+def nth(n):
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return fib_pair(n)[0]
+
+
+# F(n) mod m for any size of n. n is first reduced by the Pisano period of m (the Fibonacci numbers
+# mod m repeat with that period), so only the reduced index is computed; very large moduli skip the
+# reduction, since modular fast doubling is O(log n) anyway.
+def nth_mod(n, m):
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if m <= 0:
+        raise ValueError("m must be positive")
+    if m <= PISANO_LIMIT:
+        n %= pisano_period(m)
+    return fib_pair(n, m)[0]
+
+
+def factorize(n):
+    factors = {}
+    p = 2
+    while p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        p += 1 if p == 2 else 2
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+# Period of F(n) mod m: the lcm of the periods of its prime powers. pi(p^k) divides p^(k-1) * pi(p),
+# and pi(p) divides p - 1 when p = +-1 mod 5 and 2(p + 1) when p = +-2 mod 5, so each bound is cut
+# down by its prime factors while (F(period), F(period+1)) is still (0, 1) mod p^k.
+# time complexity is sqrt(m) for the factorization
+@lru_cache(maxsize=None)
+def pisano_period(m):
+    if m == 1:
+        return 1
+    period = 1
+    for p, k in factorize(m).items():
+        if p == 2:
+            bound = 3
+        elif p == 5:
+            bound = 20
+        else:
+            bound = p - 1 if p % 5 in (1, 4) else 2 * (p + 1)
+        bound *= p ** (k - 1)
+        modulus = p ** k
+        for q in factorize(bound):
+            while bound % q == 0 and fib_pair(bound // q, modulus) == (0, 1):
+                bound //= q
+        period = lcm(period, bound)
+    return period
+
+
+# Cross-checks nth and nth_mod against the list generator and against each other
+def check(limit=500):
+    series = fibonaci(limit + 1)
+    for n in range(limit + 1):
+        assert nth(n) == series[n], n
+        for m in (1, 2, 3, 5, 7, 10, 97, 1000, 2**16, 10**9 + 7):
+            assert nth_mod(n, m) == series[n] % m, (n, m)
+    for m in range(2, 200):  # The period found must be the smallest one
+        period = pisano_period(m)
+        pairs = [(series[i] % m, series[i + 1] % m) for i in range(1, period)] if period < limit else []
+        assert (0, 1) not in pairs and fib_pair(period, m) == (0, 1), m
+    big = 10**5 + 3
+    assert nth_mod(big, 10**9 + 7) == nth(big) % (10**9 + 7)
+    assert nth_mod(10**100, 10**9) == fib_pair(10**100, 10**9)[0]
+    assert list(fibonaci_iter(0, limit + 1)) == series
+    assert list(fibonaci_iter(limit // 2, limit + 1)) == series[limit // 2:]
+    assert list(fibonaci_iter(limit, limit)) == []
+    if np is not None:
+        for number in (-1, 0, 1, 2, 3, 10, 92, 93, 94, 1477, 1478):
+            array, series = fibonaci_array(number), fibonaci(number)
+            if array.dtype == np.float64:
+                assert all(abs(x - y) <= y * 1e-14 for x, y in zip(array.tolist(), series)), number
+            else:
+                assert array.tolist() == series, number
+        assert fibonaci_array(93).dtype == np.int64 and fibonaci_array(94).dtype == np.uint64
+        assert fibonaci_array(1477).dtype == np.float64 and fibonaci_array(1478).dtype == object
+    print("nth, nth_mod, fibonaci_iter and fibonaci_array agree with fibonaci()")
+
+
+if __name__ == "__main__":
+    # python Fibonaci_Method.py --check
+    # python Fibonaci_Method.py --stream START [STOP]   (no STOP streams until interrupted)
+    if len(sys.argv) > 1 and sys.argv[1] == '--check':
+        check()
+    elif len(sys.argv) > 2 and sys.argv[1] == '--stream':
+        stream(int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else None)
+    else:
+        number=int(input("Enter the number:"))
+        print(fibonaci(number))
+        print(f"F({number}) =", nth(max(number, 0)))
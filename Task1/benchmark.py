@@ -0,0 +1,211 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections import deque
+
+try:  # Imported from the repository root, e.g. `import Task1.benchmark`
+    from .Fibonachi_Class import fibo
+    from .Fibonaci_Method import fibonaci, fibonaci_array, fibonaci_iter, nth, nth_mod, np
+except ImportError:  # Run as a script, or imported with Task1/ on sys.path
+    from Fibonachi_Class import fibo
+    from Fibonaci_Method import fibonaci, fibonaci_array, fibonaci_iter, nth, nth_mod, np
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+SIZES = [10, 100, 1000, 10**4, 10**5, 10**6]
+NOISE_SECONDS = 1e-4  # Timings below this are never counted as regressions
+NOISE_BYTES = 4096
+TIME_EXPONENT_TOLERANCE = 0.35  # Timings of two sizes are noisy: the same run varies by about 0.25
+MEMORY_EXPONENT_TOLERANCE = 0.15
+
+# Expected growth of time and peak memory as powers of n, measured between the two largest sizes each
+# variant runs for, and checked on both sides. Asymptotically the list APIs are n^2 (F(n) has about
+# 0.69 * n bits), nth is Karatsuba's n^1.58 and nth_mod log n. At the sizes measured the per-term cost
+# (object headers, list slots, the interpreter loop) is still a large share, so the exponents are
+# lower: n terms take about 36 * n + 0.043 * n^2 bytes, which grows as n^1.77 from 10^3 to 10^4. A
+# variant drifting either way (a quadratic step sneaking in, or work being skipped) fails the check.
+CLAIMS = {
+    'fiboseries': (2.3, 2.3),  # n prefixes of up to 1000 terms
+    'fibonaci': (1.6, 1.77),
+    'fibo.fibonaci (cold)': (1.2, 1.7),
+    'fibo.fibonaci (cached)': (1.0, 1.0),  # A slice: one reference per term
+    'fibonaci_iter': (1.85, 1.0),  # Only the last two terms are alive
+    'nth': (1.58, 1.0),
+    'nth_mod': (0.1, 0.0),  # log n steps on numbers below m: log(10^6) / log(10^5) = n^0.08
+    'list + np.array': (1.0, 1.74),
+    'fibonaci_array': (0.0, 0.9),  # At most 1000 float64s copied from the table: call overhead dominates
+    'fibonaci_array (object)': (1.4, 1.77),
+}
+
+# The commented-out fibo.fiboseries: one list per prefix length, O(n^2) terms in total
+def fiboseries(number):
+    return [fibonaci(i) for i in range(number)]
+
+
+def class_cold(number):
+    fibo.clear_cache()
+    return fibo().fibonaci(number)
+
+
+def class_warm(number):
+    return fibo().fibonaci(number)  # The cache was filled by the setup call
+
+
+def iterate(number):
+    deque(fibonaci_iter(0, number), maxlen=0)
+
+
+def list_then_array(number):
+    return np.array(fibonaci(number), dtype=object if number > 1477 else None)  # What callers do today
+
+
+# name: (function, largest n it is run for, setup run before measuring). The list variants stop at
+# 10^4: n terms take about 0.046 * n^2 bytes, so 10^5 would need 460 MB and 10^6 46 GB.
+VARIANTS = {
+    'fiboseries': (fiboseries, 1000, None),
+    'fibonaci': (fibonaci, 10**4, None),
+    'fibo.fibonaci (cold)': (class_cold, 10**4, None),
+    'fibo.fibonaci (cached)': (class_warm, 10**4, class_warm),
+    'fibonaci_iter': (iterate, 10**6, None),
+    'nth': (nth, 10**6, None),
+    'nth_mod': (lambda number: nth_mod(number, 10**9 + 7), 10**6, None),
+}
+if np is not None:
+    VARIANTS['list + np.array'] = (list_then_array, 10**4, None)
+    VARIANTS['fibonaci_array'] = (fibonaci_array, 1000, None)  # Fixed width up to F(1476)
+    VARIANTS['fibonaci_array (object)'] = (lambda number: fibonaci_array(number, object), 10**4, None)
+
+
+# Best time per call: enough calls to fill 0.2 s, best of three rounds. A call slower than a second
+# is timed once.
+def seconds_per_call(func, number):
+    timer = timeit.Timer(lambda: func(number))
+    calls, total = timer.autorange()
+    if calls == 1 and total > 1:
+        return total
+    return min([total] + timer.repeat(repeat=2, number=calls)) / calls
+
+
+def peak_bytes(func, number):
+    tracemalloc.start()
+    try:
+        func(number)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# Slope of log(cost) against log(n) between the two largest sizes: ~1 for linear, ~2 for quadratic
+def exponent(results, key):
+    sizes = [size for size in results if results[size][key] > 0]
+    if len(sizes) < 2:
+        return None
+    small, large = sizes[-2], sizes[-1]
+    growth = results[large][key] / results[small][key]
+    return round(math.log(growth) / math.log(int(large) / int(small)), 2)
+
+
+def run(variants, sizes, log=sys.stderr):
+    report = {}
+    for name, (func, cap, setup) in variants.items():
+        results = {}
+        for size in sizes:
+            if size > cap:
+                continue
+            if setup:
+                setup(size)
+            results[str(size)] = {
+                'seconds': round(seconds_per_call(func, size), 9),
+                'peak_bytes': peak_bytes(func, size),
+            }
+            print(f"{name:24} n={size:<8} {results[str(size)]['seconds'] * 1e3:12.4f} ms "
+                  f"{results[str(size)]['peak_bytes'] / 1024:12.1f} KB", file=log)
+        report[name] = {
+            'sizes': results,
+            'time_exponent': exponent(results, 'seconds'),
+            'memory_exponent': exponent(results, 'peak_bytes'),
+        }
+    fibo.clear_cache()
+    return report
+
+
+# Regressions of `current` against `baseline`: a variant/size more than 1 + time_tolerance times
+# slower, or with a peak more than 1 + memory_tolerance times larger. Exponents are reported only,
+# they are too noisy between two sizes to fail on.
+def compare(current, baseline, time_tolerance, memory_tolerance):
+    problems = []
+    for name, variant in baseline['variants'].items():
+        for size, then in variant['sizes'].items():
+            now = current['variants'].get(name, {}).get('sizes', {}).get(size)
+            if now is None:
+                continue
+            if now['seconds'] > max(then['seconds'] * (1 + time_tolerance), NOISE_SECONDS):
+                problems.append(f"{name} n={size}: {now['seconds']:.6f} s is "
+                                f"{now['seconds'] / then['seconds']:.1f}x the baseline {then['seconds']:.6f} s")
+            if now['peak_bytes'] > max(then['peak_bytes'] * (1 + memory_tolerance), NOISE_BYTES):
+                problems.append(f"{name} n={size}: peak {now['peak_bytes']} bytes is "
+                                f"{now['peak_bytes'] / then['peak_bytes']:.2f}x the baseline {then['peak_bytes']}")
+    return problems
+
+
+# Variants whose measured exponent is further than the tolerance from its claim, in either direction.
+# The claims hold for the two largest sizes of each variant, so runs cut short by --max-n are not checked.
+def check_claims(report):
+    problems = []
+    for name, variant in report['variants'].items():
+        if max(map(int, variant['sizes']), default=0) != VARIANTS[name][1]:
+            continue
+        for key, claimed, tolerance in zip(('time_exponent', 'memory_exponent'), CLAIMS[name],
+                                           (TIME_EXPONENT_TOLERANCE, MEMORY_EXPONENT_TOLERANCE)):
+            measured = variant[key]
+            if measured is not None and abs(measured - claimed) > tolerance:
+                problems.append(f"{name}: {key} {measured} is not within {tolerance} of the expected n^{claimed}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and peak memory of the Task1 Fibonacci implementations.")
+    parser.add_argument('--max-n', type=int, default=max(SIZES), help="Skip sizes above this")
+    parser.add_argument('--variant', action='append', choices=list(VARIANTS), help="Only run these (repeatable)")
+    parser.add_argument('--baseline', default=BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument('--time-tolerance', type=float, default=1.0,
+                        help="Allowed slowdown before failing; 1.0 fails anything more than twice as slow")
+    parser.add_argument('--memory-tolerance', type=float, default=0.2, help="Allowed relative growth of peak memory")
+    parser.add_argument('--update-baseline', action='store_true', help="Write this run's results as the new baseline")
+    parser.add_argument('--report', help="Also write this run's results to this JSON file")
+    args = parser.parse_args(argv)
+
+    variants = {name: VARIANTS[name] for name in args.variant or VARIANTS}
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__ if np is not None else None,
+        'variants': run(variants, [size for size in SIZES if size <= args.max_n]),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.report:
+        with open(args.report, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    problems = check_claims(report)
+    missing = False
+    if args.update_baseline:
+        with open(args.baseline, 'w') as fh:
+            json.dump(report, fh, indent=2)
+            fh.write('\n')
+    elif not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        missing = True  # Nothing was compared, which must not pass as "no regressions"
+    else:
+        with open(args.baseline) as fh:
+            problems += compare(report, json.load(fh), args.time_tolerance, args.memory_tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    return 1 if problems or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,58 @@
+import sys
+
+try:
+    from . import shapes  # Imported from the repository root, e.g. `import Task2.Patterns`
+except ImportError:
+    import shapes  # Run as a script, or imported with Task2/ on sys.path
+
+
+# Each pattern goes through the shape engine (shapes.py): every row is built once as a string and the
+# output is written in large blocks instead of one print() per character
 def pattern1(row):
+    write(1, row)
+
+
+def pattern2(row):
+    write(2, row)
+
+
+def pattern3(row):
+    write(3, row)
+
+
+def pattern4(row):
+    write(4, row)
+
+
+def pattern5(row):
+    write(5, row)
+
+
+def render(pattern, row):
+    return shapes.render(shapes.SHAPES[pattern], row)
+
+
+def write(pattern, row, out=None, block_size=1 << 20):
+    shapes.write(shapes.SHAPES[pattern], row, out, block_size)
+
+
+# The original loops printing one character at a time, kept as the reference the shapes are checked
+# against (shapes.check(), benchmark())
+def pattern1_by_character(row):
     for i in range(row):
         for j in range(row,i,-1):
             print("*",end=" ")   
         print()
  
  
-def pattern2(row):
+def pattern2_by_character(row):
     for i in range(row+1):
         for j in range(i,):
             print("*",end=" ")
         print()     
  
 
-def pattern3(row):
+def pattern3_by_character(row):
     for i in range(row+1):
         for j in range(row-i):
             print(end=" ") 
@@ -21,7 +61,7 @@ def pattern3(row):
         print()   
         
 
-def pattern4(row):
+def pattern4_by_character(row):
     for i in range(row+1):
         for j in range(row-i):
             print(end=" ") 
@@ -30,7 +70,7 @@ def pattern4(row):
         print() 
             
             
-def pattern5(row):
+def pattern5_by_character(row):
      for i in range(row+1):
         for j in range(row-i):
             print(end=" ") 
@@ -46,9 +86,46 @@ def pattern5(row):
          print()  
    
                  
-pattern1(6)  
-pattern2(6)   
-pattern3(6) 
-pattern4(6) 
-pattern5(6)  
-        
\ No newline at end of file
+# Prints every pattern both ways into memory to check they match, then times both writing to
+# os.devnull (through a real file, so the per-character version pays for its writes)
+def benchmark(row=5000):
+    import io
+    import os
+    import time
+    from contextlib import redirect_stdout
+
+    originals = {
+        1: pattern1_by_character, 2: pattern2_by_character, 3: pattern3_by_character,
+        4: pattern4_by_character, 5: pattern5_by_character,
+    }
+    for pattern, original in originals.items():
+        for size in (0, 1, 2, 6, 50):
+            printed = io.StringIO()
+            with redirect_stdout(printed):
+                original(size)
+            assert printed.getvalue() == render(pattern, size), (pattern, size)
+
+    with open(os.devnull, 'w') as devnull:
+        for pattern, original in originals.items():
+            started = time.perf_counter()
+            with redirect_stdout(devnull):
+                original(row)
+            printed = time.perf_counter() - started
+            started = time.perf_counter()
+            write(pattern, row, devnull)
+            written = time.perf_counter() - started
+            size = len(render(pattern, row))
+            print(f"pattern{pattern}({row}) {size / 1e6:7.1f} MB  print per character {printed:8.2f} s  "
+                  f"write() {written:6.3f} s  {printed / written:7.0f}x")
+
+
+if __name__ == "__main__":
+    # python Patterns.py --benchmark [row]
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 5000)
+    else:
+        pattern1(6)
+        pattern2(6)
+        pattern3(6)
+        pattern4(6)
+        pattern5(6)
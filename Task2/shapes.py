@@ -0,0 +1,139 @@
+import sys
+from dataclasses import dataclass
+from typing import Callable
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only needed for grid()
+    np = None
+
+
+# A pattern described row by row: row i (for i in indices(size)) is indent(i, size) spaces followed
+# by width(i, size) copies of cell (a negative width gives no cells). With mirror, the rows strictly
+# between the first and the last follow again in reverse order, which turns a triangle into a diamond.
+@dataclass(frozen=True)
+class Shape:
+    indices: Callable[[int], range]
+    indent: Callable[[int, int], int]
+    width: Callable[[int, int], int]
+    cell: str = "*"
+    mirror: bool = False
+
+
+def no_indent(i, size):
+    return 0
+
+
+def right_aligned(i, size):
+    return size - i
+
+
+def odd_width(i, size):
+    return 2 * i - 1
+
+
+# The five patterns of Patterns.py
+SHAPES = {
+    1: Shape(lambda size: range(size), no_indent, lambda i, size: size - i, cell="* "),
+    2: Shape(lambda size: range(size + 1), no_indent, lambda i, size: i, cell="* "),
+    3: Shape(lambda size: range(size + 1), right_aligned, lambda i, size: i),
+    4: Shape(lambda size: range(size + 1), right_aligned, odd_width),
+    5: Shape(lambda size: range(size + 1), right_aligned, odd_width, mirror=True),
+}
+
+
+def row_indices(shape, size):
+    indices = shape.indices(size)
+    yield from indices
+    if shape.mirror:
+        yield from reversed(indices[1:-1])
+
+
+# The rows of the shape, without "\n". Every row is a slice of one template holding the widest indent
+# followed by the widest run of cells, so building a row is a single copy and nothing is kept between
+# rows but the template (about two rows of memory, whatever the size).
+def rows(shape, size):
+    indices = shape.indices(size)
+    pad = max((max(shape.indent(i, size), 0) for i in indices), default=0)
+    cells = max((max(shape.width(i, size), 0) for i in indices), default=0)
+    template = " " * pad + shape.cell * cells
+    step = len(shape.cell)
+    for i in row_indices(shape, size):
+        indent = max(shape.indent(i, size), 0)
+        yield template[pad - indent:pad + step * max(shape.width(i, size), 0)]
+
+
+def render(shape, size):
+    return "".join(f"{row}\n" for row in rows(shape, size))
+
+
+# Writes the shape to `out` (stdout by default) in blocks of about `block_size` characters. Memory
+# stays bounded by the block and the row template, whatever the size.
+def write(shape, size, out=None, block_size=1 << 20):
+    out = out or sys.stdout
+    block, length = [], 0
+    for row in rows(shape, size):
+        block.append(row)
+        length += len(row) + 1
+        if length >= block_size:
+            out.write("\n".join(block) + "\n")
+            block, length = [], 0
+    if block:
+        out.write("\n".join(block) + "\n")
+
+
+# The shape as a 2-D array of single characters, one array row per row, padded on the right with
+# spaces to the longest row. Filled by comparing whole column/row index arrays, with no loop over
+# characters. Takes 4 bytes per cell, so it is meant for shapes of a few thousand rows at most.
+def grid(shape, size):
+    if np is None:
+        raise ImportError("grid() needs numpy")
+    indices = list(row_indices(shape, size))
+    starts = np.array([shape.indent(i, size) for i in indices], dtype=np.int64)
+    cells = np.array([max(shape.width(i, size), 0) for i in indices], dtype=np.int64)
+    ends = starts + cells * len(shape.cell)
+    columns = np.arange(max(ends.max(initial=0), 1))
+    offset = columns - starts[:, None]
+    inside = (offset >= 0) & (columns < ends[:, None])
+    cell = np.array(list(shape.cell))
+    return np.where(inside, cell[offset % len(shape.cell)], " ")
+
+
+# Checks every shape against the per-character printing in Patterns.py, and that pattern1 .. pattern5
+# (which print through this engine) still give the same text
+def check(sizes=(0, 1, 2, 6, 50)):
+    import io
+    from contextlib import redirect_stdout
+
+    try:
+        from . import Patterns
+    except ImportError:
+        import Patterns
+
+    for number, shape in SHAPES.items():
+        for size in sizes:
+            printed = io.StringIO()
+            with redirect_stdout(printed):
+                getattr(Patterns, f"pattern{number}_by_character")(size)
+            assert render(shape, size) == printed.getvalue(), (number, size)
+            through_engine = io.StringIO()
+            with redirect_stdout(through_engine):
+                getattr(Patterns, f"pattern{number}")(size)
+            assert through_engine.getvalue() == printed.getvalue(), (number, size)
+            if np is not None:
+                lines = printed.getvalue().split("\n")[:-1]
+                width = max((len(line) for line in lines), default=0) or 1
+                assert ["".join(row) for row in grid(shape, size)] == [line.ljust(width) for line in lines]
+    print("shapes match pattern1 .. pattern5")
+
+
+# python shapes.py --check
+# python shapes.py PATTERN SIZE [FILE]   e.g. python shapes.py 5 10000 diamond.txt
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--check':
+        check()
+    elif len(sys.argv) > 3:
+        with open(sys.argv[3], 'w') as fh:
+            write(SHAPES[int(sys.argv[1])], int(sys.argv[2]), fh)
+    elif len(sys.argv) > 2:
+        write(SHAPES[int(sys.argv[1])], int(sys.argv[2]))
@@ -0,0 +1,323 @@
+import argparse
+import errno
+import hashlib
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from shutil import SpecialFileError
+from stat import S_ISREG
+
+BLOCK_SIZE = 1 << 20
+# Kernel-side copy calls still believed to work here. One is dropped for the whole process the first
+# time it reports that it does not exist or is not supported (old kernel, not Linux); errors that can
+# depend on the file (another filesystem, a special file) only send that file to the next method.
+UNSUPPORTED = {errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP}
+UNSUPPORTED_HERE = {errno.EXDEV, errno.EINVAL, errno.EBADF}
+methods = [name for name in ('copy_file_range', 'sendfile') if hasattr(os, name)]
+methods_lock = threading.Lock()  # Copy threads disable methods concurrently
+
+
+# Yields (relative path, os.stat_result) for every file under source, creating the matching
+# directories under destination on the way, so a file's directory always exists before it is copied.
+# Symlinks are recreated as symlinks, never followed. A directory that cannot be read or created, a
+# symlink that cannot be recreated, a file that vanishes and a special file (FIFO, socket, device,
+# which shutil also refuses with SpecialFileError) are yielded as (relative path, OSError)
+# instead, so they are reported and the rest of the tree is still copied.
+def walk(source, destination):
+    stack = ['']
+    while stack:
+        relative = stack.pop()
+        try:
+            os.makedirs(os.path.join(destination, relative), exist_ok=True)
+            with os.scandir(os.path.join(source, relative)) as entries:
+                for entry in entries:
+                    path = os.path.join(relative, entry.name)
+                    try:
+                        if entry.is_symlink():
+                            copy_symlink(entry.path, os.path.join(destination, path))
+                        elif entry.is_dir():
+                            stack.append(path)
+                        else:
+                            stat = entry.stat(follow_symlinks=False)
+                            if S_ISREG(stat.st_mode):
+                                yield path, stat
+                            else:  # Opening a FIFO would block its copy thread forever
+                                yield path, SpecialFileError(f"{entry.path} is not a regular file (FIFO, socket or device)")
+                    except OSError as exc:
+                        yield path, exc
+        except OSError as exc:
+            yield relative or '.', exc
+
+
+def copy_symlink(source, target):
+    link = os.readlink(source)
+    if os.path.islink(target) and os.readlink(target) == link:
+        return
+    if os.path.lexists(target):
+        os.remove(target)
+    os.symlink(link, target)
+
+
+def file_hash(path):
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as fh:
+        while block := fh.read(BLOCK_SIZE):
+            digest.update(block)
+    return digest.digest()
+
+
+# Same size and modification time (copies get the source's mtime), or with checksum the same size
+# and contents
+def unchanged(source, target, stat, checksum=False):
+    try:
+        existing = os.stat(target)
+    except FileNotFoundError:
+        return False
+    if existing.st_size != stat.st_size:
+        return False
+    if checksum:
+        return file_hash(source) == file_hash(target)
+    return existing.st_mtime_ns == stat.st_mtime_ns
+
+
+# Copies the whole file from src_fd to dst_fd inside the kernel when possible, without passing the
+# data through Python. Returns the method that did (most of) the work. A kernel call that reports the
+# end of the file before `size` bytes (some filesystems return 0 instead of an error) hands the rest
+# to the next method, and finally to plain read/write.
+def copy_data(src_fd, dst_fd, size):
+    copied = 0
+    for method in list(methods):
+        try:
+            while True:
+                if method == 'copy_file_range':
+                    count = os.copy_file_range(src_fd, dst_fd, BLOCK_SIZE * 64, copied, copied)
+                else:
+                    os.lseek(dst_fd, copied, os.SEEK_SET)
+                    count = os.sendfile(dst_fd, src_fd, copied, BLOCK_SIZE * 64)
+                if not count:
+                    break
+                copied += count
+            if copied >= size:
+                return method
+        except OSError as exc:
+            if exc.errno in UNSUPPORTED:
+                with methods_lock:
+                    if method in methods:
+                        methods.remove(method)
+            elif exc.errno not in UNSUPPORTED_HERE:
+                raise
+    os.lseek(src_fd, copied, os.SEEK_SET)
+    os.lseek(dst_fd, copied, os.SEEK_SET)
+    while block := os.read(src_fd, BLOCK_SIZE):
+        view = memoryview(block)
+        while view:
+            view = view[os.write(dst_fd, view):]
+    return 'read/write'
+
+
+# Copies into a temporary file next to the target and renames it over the target, so an interrupted
+# run never leaves a truncated file that a later run would take as unchanged. Permissions and
+# access/modification times are copied like shutil.copy2.
+def copy_file(source, target, stat):
+    temporary = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.sync-tmp")
+    try:
+        with open(source, 'rb') as src, open(temporary, 'wb') as dst:
+            method = copy_data(src.fileno(), dst.fileno(), stat.st_size)
+            written = os.fstat(dst.fileno()).st_size
+            if written != stat.st_size:  # Truncated or grown while copying: never report it as copied
+                raise OSError(errno.EIO, f"copied {written} bytes, expected {stat.st_size}", source)
+            os.fchmod(dst.fileno(), stat.st_mode & 0o7777)
+        os.utime(temporary, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(temporary, target)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return method
+
+
+# Runs in a pool thread: one record per file
+def copy_chunk(files, source, destination, checksum):
+    records = []
+    for path, stat in files:
+        if isinstance(stat, OSError):  # Failed during the walk
+            records.append({'path': path, 'bytes': 0, 'action': 'error', 'error': str(stat)})
+            continue
+        record = {'path': path, 'bytes': stat.st_size}
+        try:
+            src, target = os.path.join(source, path), os.path.join(destination, path)
+            if unchanged(src, target, stat, checksum):
+                record['action'] = 'skipped'
+            else:
+                record['action'] = 'copied'
+                record['method'] = copy_file(src, target, stat)
+        except OSError as exc:
+            record['action'] = 'error'
+            record['error'] = str(exc)
+        records.append(record)
+    return records
+
+
+# True when destination is source or lies inside it: the walk would copy the copy, again and again
+def nested(source, destination):
+    source, destination = os.path.realpath(source), os.path.realpath(destination)
+    return os.path.commonpath([source, destination]) == source
+
+
+# Yields one record per file as chunks complete (not in walk order). The walk runs in the calling
+# thread while the pool copies; at most max_in_flight chunks are queued, so memory stays flat for
+# trees of millions of files.
+def sync_tree(source, destination, workers=None, chunk_size=64, max_in_flight=None, checksum=False):
+    if nested(source, destination):
+        raise ValueError(f"destination {destination} is inside source {source}")
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)  # Copies mostly wait on the disk
+    max_in_flight = max_in_flight or workers * 2
+    files = walk(source, destination)
+
+    with ThreadPoolExecutor(workers) as executor:
+        pending = set()
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = list(itertools.islice(files, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(copy_chunk, chunk, source, destination, checksum))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+class SyncStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.files = dict.fromkeys(['copied', 'skipped', 'error'], 0)
+        self.bytes_copied = 0
+        self.methods = {}
+
+    def add(self, record):
+        self.files[record['action']] += 1
+        if record['action'] == 'copied':
+            self.bytes_copied += record['bytes']
+            self.methods[record['method']] = self.methods.get(record['method'], 0) + 1
+
+    def report(self):
+        seconds = time.perf_counter() - self.started
+        total = sum(self.files.values())
+        return {
+            'files': total,
+            **self.files,
+            'bytes_copied': self.bytes_copied,
+            'seconds': round(seconds, 3),
+            'files_per_second': round(total / seconds, 1) if seconds else 0.0,
+            'megabytes_per_second': round(self.bytes_copied / seconds / 1e6, 2) if seconds else 0.0,
+            'methods': self.methods,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copy a directory tree in parallel, skipping files that are already up to date.")
+    parser.add_argument('source')
+    parser.add_argument('destination', help="Created if missing; existing files are updated in place")
+    parser.add_argument('--checksum', action='store_true', help="Compare contents instead of size and mtime")
+    parser.add_argument('--workers', type=int, default=None, help="Copy threads (default: 4 per CPU, at most 32)")
+    parser.add_argument('--chunk-size', type=int, default=64, help="Files per task sent to a thread")
+    parser.add_argument('--max-in-flight', type=int, default=None, help="Chunks queued at once (default: 2 per thread)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Print every copied file")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.source):
+        parser.error(f"{args.source} is not a directory")
+    if nested(args.source, args.destination):
+        parser.error(f"{args.destination} is inside {args.source}")
+
+    stats = SyncStats()
+    for record in sync_tree(args.source, args.destination, args.workers, args.chunk_size, args.max_in_flight, args.checksum):
+        stats.add(record)
+        if record['action'] == 'error':
+            print(f"{record['path']}: {record['error']}", file=sys.stderr)
+        elif args.verbose and record['action'] == 'copied':
+            print(record['path'])
+
+    report = stats.report()
+    print(json.dumps(report), file=sys.stderr)
+    return 1 if report['error'] else 0
+
+
+# Copies a small tree into a temporary directory and checks every kind of entry: nested directories,
+# symlinks, unchanged files being skipped, a FIFO reported instead of blocking, a kernel copy that
+# stops short falling back to read/write, and a destination inside the source being refused.
+def check():
+    import socket
+    import tempfile
+
+    def run(source, destination, **options):
+        return {record['path']: record for record in sync_tree(source, destination, workers=2, chunk_size=2, **options)}
+
+    with tempfile.TemporaryDirectory() as root:
+        source, destination = os.path.join(root, 'src'), os.path.join(root, 'dst')
+        os.makedirs(os.path.join(source, 'a', 'b', 'c'))
+        files = {'top.txt': b'top', 'a/one.bin': os.urandom(3 * BLOCK_SIZE + 7), 'a/b/c/deep.txt': b'deep', 'a/empty': b''}
+        for path, data in files.items():
+            with open(os.path.join(source, path), 'wb') as fh:
+                fh.write(data)
+        os.symlink('top.txt', os.path.join(source, 'link'))
+        os.symlink('missing', os.path.join(source, 'a', 'dangling'))
+        special = ['fifo']
+        os.mkfifo(os.path.join(source, 'fifo'))
+        if hasattr(socket, 'AF_UNIX') and len(os.path.join(source, 'sock')) < 100:
+            with socket.socket(socket.AF_UNIX) as sock:
+                sock.bind(os.path.join(source, 'sock'))
+            special.append('sock')
+
+        records = run(source, destination)
+        assert {path: record['action'] for path, record in records.items()} == {
+            **dict.fromkeys(files, 'copied'), **dict.fromkeys(special, 'error'),
+        }, records
+        for path, data in files.items():
+            with open(os.path.join(destination, path), 'rb') as fh:
+                assert fh.read() == data, path
+            assert os.stat(os.path.join(destination, path)).st_mtime_ns == os.stat(os.path.join(source, path)).st_mtime_ns
+        assert os.readlink(os.path.join(destination, 'link')) == 'top.txt'
+        assert os.readlink(os.path.join(destination, 'a', 'dangling')) == 'missing'
+        assert not any(os.path.lexists(os.path.join(destination, path)) for path in special)
+
+        # Nothing changed: everything is skipped, with and without checksums
+        for checksum in (False, True):
+            assert {record['action'] for record in run(source, destination, checksum=checksum).values() if record['path'] not in special} == {'skipped'}
+        with open(os.path.join(source, 'a/b/c/deep.txt'), 'wb') as fh:
+            fh.write(b'DEEP')  # Same size; a new mtime
+        records = run(source, destination)
+        assert [path for path, record in records.items() if record['action'] == 'copied'] == ['a/b/c/deep.txt']
+
+        # A kernel copy that stops early is finished with read/write, not reported as complete
+        real = getattr(os, 'copy_file_range', None)
+        if real is not None and 'copy_file_range' in methods:
+            os.copy_file_range = lambda src, dst, count, offset_src, offset_dst: 0 if offset_src else real(src, dst, 1000, offset_src, offset_dst)
+            try:
+                short = os.path.join(root, 'short')
+                record = run(source, short)['a/one.bin']
+            finally:
+                os.copy_file_range = real
+            with open(os.path.join(short, 'a/one.bin'), 'rb') as fh:
+                assert record['action'] == 'copied' and fh.read() == files['a/one.bin'], record
+
+        try:
+            list(sync_tree(source, os.path.join(source, 'a', 'backup')))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a destination inside the source was accepted")
+    print("sync_tree copies, skips and reports every kind of entry")
+
+
+# python sync_copy.py --check
+if __name__ == "__main__":
+    if sys.argv[1:] == ['--check']:
+        check()
+    else:
+        sys.exit(main())
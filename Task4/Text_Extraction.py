@@ -22,15 +22,6 @@ def value_extract(text):
     amount_due = re.findall(amount_due_pattern, text, re.I)
     amount_paid = re.findall(amount_paid_pattern, text, re.I)
     
-    print("Email:", email)
-    print("Tel:", Tel)
-    print("ABN:", abn)
-    print("Due Date:", due_date)
-    print("Invoice Date:", invoice_date)
-    print("Amount Due:", amount_due)
-    print("Amount Paid:", amount_paid)
-    
-    
     list=[email,Tel,abn,due_date,invoice_date,amount_due,amount_paid]
     
     return list
@@ -53,5 +44,13 @@ string = (
     "pleaseusetheinvoicenumberasthepaymentreference."
 )
 
-value_extract(string)
+if __name__ == "__main__":
+    email, Tel, abn, due_date, invoice_date, amount_due, amount_paid = value_extract(string)
+    print("Email:", email)
+    print("Tel:", Tel)
+    print("ABN:", abn)
+    print("Due Date:", due_date)
+    print("Invoice Date:", invoice_date)
+    print("Amount Due:", amount_due)
+    print("Amount Paid:", amount_paid)
 # print(value_extract(string))
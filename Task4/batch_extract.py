@@ -0,0 +1,154 @@
+import argparse
+import csv
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from invoice_scanner import scan_lists
+
+FIELDS = ['email', 'tel', 'abn', 'due_date', 'invoice_date', 'amount_due', 'amount_paid']
+
+
+# Documents are (name, text, path) tuples: JSONL documents carry their text, files are read by the worker
+def iter_documents(source, pattern='*.txt'):
+    if source == '-':
+        yield from iter_jsonl(sys.stdin)
+    elif source.endswith('.jsonl'):
+        with open(source, encoding='utf-8') as stream:
+            yield from iter_jsonl(stream)
+    elif os.path.isdir(source):
+        for path in glob.iglob(os.path.join(source, '**', pattern), recursive=True):
+            yield os.path.relpath(path, source), None, path
+    else:
+        for path in glob.iglob(source, recursive=True):
+            yield path, None, path
+
+
+def iter_jsonl(stream):
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            document = json.loads(line)
+            yield str(document.get('name', document.get('id', number))), document['text'], None
+
+
+# Runs in a worker process
+def extract_chunk(documents):
+    records = []
+    for name, text, path in documents:
+        record = {'name': name}
+        try:
+            if text is None:
+                with open(path, encoding='utf-8', errors='replace') as fh:
+                    text = fh.read()
+            record.update(zip(FIELDS, scan_lists(text)))
+        except (OSError, UnicodeError) as exc:
+            record['error'] = str(exc)
+        records.append(record)
+    return records
+
+
+# Yield one record per document as chunks complete (not in input order). At most max_in_flight
+# chunks are queued or running at a time, so memory does not grow with the corpus size.
+def extract_batch(documents, workers=None, chunk_size=64, max_in_flight=None):
+    workers = workers or os.cpu_count()
+    max_in_flight = max_in_flight or workers * 2
+    documents = iter(documents)
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = set()
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = list(itertools.islice(documents, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(extract_chunk, chunk))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+class JSONLWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        self.stream.write(json.dumps(record) + '\n')
+
+
+# One row per document; several matches of a field are joined with "|"
+class CSVWriter:
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.writer.writerow(['name', *FIELDS, 'error'])
+
+    def write(self, record):
+        self.writer.writerow(
+            [record['name'], *('|'.join(record.get(name, [])) for name in FIELDS), record.get('error', '')]
+        )
+
+
+class BatchStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.documents = 0
+        self.errors = 0
+        self.hits = dict.fromkeys(FIELDS, 0)  # Documents with at least one match per field
+
+    def add(self, record):
+        self.documents += 1
+        if 'error' in record:
+            self.errors += 1
+        for name in FIELDS:
+            if record.get(name):
+                self.hits[name] += 1
+
+    def report(self):
+        seconds = time.perf_counter() - self.started
+        return {
+            'documents': self.documents,
+            'errors': self.errors,
+            'seconds': round(seconds, 3),
+            'documents_per_second': round(self.documents / seconds, 1) if seconds else 0.0,
+            'hit_rates': {
+                name: round(hits / self.documents, 4) if self.documents else 0.0
+                for name, hits in self.hits.items()
+            },
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract invoice fields from many OCR text documents in parallel.")
+    parser.add_argument('source', help="Directory, glob pattern, JSONL file of {\"name\", \"text\"} objects, or - for JSONL on stdin")
+    parser.add_argument('-o', '--output', default='-', help="Output file (default: stdout)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="Output format (default: from the output suffix, else jsonl)")
+    parser.add_argument('--pattern', default='*.txt', help="File pattern when source is a directory")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=64, help="Documents per task sent to a worker")
+    parser.add_argument('--max-in-flight', type=int, default=None, help="Chunks queued at once (default: 2 per worker)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ('csv' if args.output.endswith('.csv') else 'jsonl')
+    stream = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    writer = CSVWriter(stream) if output_format == 'csv' else JSONLWriter(stream)
+    stats = BatchStats()
+
+    try:
+        documents = iter_documents(args.source, args.pattern)
+        for record in extract_batch(documents, args.workers, args.chunk_size, args.max_in_flight):
+            writer.write(record)
+            stats.add(record)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    print(json.dumps(stats.report()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+from corpus import FIELDS, InvoiceGenerator, adversarial_documents
+from invoice_scanner import scan_lists
+from regx import RegularExpressionValidator
+from stream_extract import stream_extract
+from Text_Extraction import value_extract
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+NOISE_MS = 5.0  # Latencies below this are scheduler noise on a shared machine, never a regression
+
+
+def stream_lists(text):
+    found = {name: [] for name in FIELDS}
+    for match in stream_extract(io.BytesIO(text.encode()), chunk_size=1 << 16):
+        found[match.field].append(match.value)
+    return [found[name] for name in FIELDS]
+
+
+EXTRACTORS = {
+    'value_extract': value_extract,
+    'scan_lists': scan_lists,
+    'stream_extract': stream_lists,
+}
+
+
+def run_extractor(extract, documents, adversarial):
+    correct = dict.fromkeys(FIELDS, 0)
+    latencies = []
+    started = time.perf_counter()
+    for text, truth in documents:
+        call_started = time.perf_counter()
+        result = extract(text)
+        latencies.append(time.perf_counter() - call_started)
+        for name, values in zip(FIELDS, result):
+            correct[name] += set(values) == set(truth[name])
+    seconds = time.perf_counter() - started
+    latencies.sort()
+
+    worst_adversarial = {}
+    for name, text in adversarial.items():
+        timings = []
+        for _ in range(3):  # Best of three, single runs are too noisy to compare
+            call_started = time.perf_counter()
+            extract(text)
+            timings.append(time.perf_counter() - call_started)
+        worst_adversarial[name] = round(min(timings) * 1000, 3)
+
+    size = sum(len(text) for text, _ in documents)
+    return {
+        'documents_per_second': round(len(documents) / seconds, 1),
+        'megabytes_per_second': round(size / seconds / 1e6, 3),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 3),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 3),
+        'worst_ms': round(latencies[-1] * 1000, 3),
+        'accuracy': {name: round(correct[name] / len(documents), 4) for name in FIELDS},
+        'adversarial_ms': worst_adversarial,
+    }
+
+
+def run_validators(contacts):
+    emails = [row[0] for row in contacts]
+    mobiles = [row[1] for row in contacts]
+    report = {}
+    for name, validate, values, column in (
+        ('validate_emails', RegularExpressionValidator.validate_emails, emails, 2),
+        ('validate_mobiles', RegularExpressionValidator.validate_mobiles, mobiles, 3),
+    ):
+        started = time.perf_counter()
+        mask, _ = validate(values)
+        seconds = time.perf_counter() - started
+        correct = sum(valid == row[column] for valid, row in zip(mask, contacts))
+        report[name] = {
+            'rows_per_second': round(len(values) / seconds, 1),
+            'accuracy': round(correct / len(values), 4),
+        }
+    return report
+
+
+# Regressions of `current` against `baseline`: lower accuracy (beyond 0.001), or throughput/latency more
+# than 1 + tolerance times slower than the baseline. worst_ms is reported but not compared, a single
+# slow call is usually a GC pause or another process.
+def compare(current, baseline, tolerance):
+    problems = []
+
+    def check(path, now, then):
+        if isinstance(then, dict):
+            for key, value in then.items():
+                if key in now:
+                    check(f"{path}.{key}" if path else key, now[key], value)
+        elif 'accuracy' in path:
+            if now < then - 0.001:
+                problems.append(f"{path}: accuracy {now} < baseline {then}")
+        elif path.endswith('per_second'):
+            if now * (1 + tolerance) < then:
+                problems.append(f"{path}: {now}/s is {then / now:.1f}x slower than baseline {then}/s")
+        elif (path.endswith('_ms') and not path.endswith('worst_ms')) or '_ms.' in path:
+            if now > max(then * (1 + tolerance), NOISE_MS):
+                problems.append(f"{path}: {now} ms is {now / then:.1f}x slower than baseline {then} ms")
+
+    check('', current, baseline)
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput, latency and accuracy of the Task4 regex tools on a synthetic corpus.")
+    parser.add_argument('--documents', type=int, default=2000, help="Synthetic invoices to generate")
+    parser.add_argument('--contacts', type=int, default=200000, help="Contact rows for the bulk validators")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--adversarial-size', type=int, default=5000, help="Length of the adversarial inputs")
+    parser.add_argument('--baseline', default=BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.0,
+                        help="Allowed slowdown before failing; 1.0 fails anything more than twice as slow")
+    parser.add_argument('--update-baseline', action='store_true', help="Write this run's results as the new baseline")
+    parser.add_argument('--report', help="Also write this run's results to this JSON file")
+    args = parser.parse_args(argv)
+
+    generator = InvoiceGenerator(args.seed)
+    documents = list(generator.documents(args.documents))
+    contacts = list(generator.contacts(args.contacts))
+    adversarial = adversarial_documents(args.adversarial_size)
+
+    report = {
+        # The corpus the numbers were measured on; only runs on the same corpus are compared
+        'config': {
+            'documents': args.documents,
+            'contacts': args.contacts,
+            'seed': args.seed,
+            'adversarial_size': args.adversarial_size,
+        },
+        'extractors': {name: run_extractor(extract, documents, adversarial) for name, extract in EXTRACTORS.items()},
+        'validators': run_validators(contacts),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.report:
+        with open(args.report, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as fh:
+            json.dump(report, fh, indent=2)
+            fh.write('\n')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        return 1  # Nothing was compared, which must not pass as "no regressions"
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    if baseline.get('config') != report['config']:
+        print(f"Baseline {args.baseline} was recorded with {baseline.get('config')}, this run used {report['config']}; "
+              f"rerun with the baseline's options or record a new baseline with --update-baseline", file=sys.stderr)
+        return 1
+    problems = compare(report, baseline, args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+import random
+import re
+
+FIELDS = ['email', 'tel', 'abn', 'due_date', 'invoice_date', 'amount_due', 'amount_paid']
+
+# Filler must never contain a label keyword or "@", or the ground truth would be ambiguous.
+# Zero-width so overlapping occurrences are all counted.
+KEYWORDS = re.compile(r'(?=tel|abn|duedate|invoicedate|amountdue|amountpaid|@)', re.I)
+FILLER_WORDS = [
+    'paymentadviceto', 'customer', 'invoicenumber', 'reference', 'description', 'quantity',
+    'unitprice', 'gst', 'installed', 'clientsupplied', 'light', 'jobaddress', 'subtotal',
+    'totalaud', 'amountenclosed', 'entertheamountyouarepayingabove', 'taxinvoice', 'job:',
+    'pleaseusetheinvoicenumberasthepaymentreference.', 'addcreditcardprocessingfee', 'less',
+    'salamanderstreet,dianella', 'electrical', 'services', 'pty', 'ltd', 'thankyou', 'remittance',
+]
+SYLLABLES = ['al', 'ho', 'ur', 'se', 'lec', 'tri', 'ca', 'wa', 'ser', 'vi', 'ce', 'tu', 'va', 'khu',
+             'sid', 'mo', 'ra', 'ne', 'di', 'an', 'lo', 'pe', 'ko', 'ri', 'mi', 'su']
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+MONTH_NAMES = ['january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+               'september', 'october', 'november', 'december']
+
+
+# Deterministic OCR-style invoices: lower-cased and run together like the sample string.
+# Every document comes with its ground truth, the values planted per field. A field is missing with
+# probability 1 - field_probability and repeated (like the sample's duplicated header block) with
+# probability repeat_probability. With noise_probability a label loses its colon, which is how
+# run-together OCR text breaks extraction in practice.
+class InvoiceGenerator:
+
+    def __init__(self, seed=0, field_probability=0.85, repeat_probability=0.3, noise_probability=0.05):
+        self.random = random.Random(seed)
+        self.field_probability = field_probability
+        self.repeat_probability = repeat_probability
+        self.noise_probability = noise_probability
+
+    def word(self, syllables=(2, 5)):
+        while True:
+            word = ''.join(self.random.choice(SYLLABLES) for _ in range(self.random.randint(*syllables)))
+            if not KEYWORDS.search(word):
+                return word
+
+    def digits(self, count):
+        return str(self.random.randint(1, 9)) + ''.join(str(self.random.randint(0, 9)) for _ in range(count - 1))
+
+    def filler(self, blocks):
+        parts = []
+        for _ in range(blocks):
+            if self.random.random() < 0.7:
+                parts.append(self.random.choice(FILLER_WORDS))
+            else:
+                parts.append(self.word())
+        return ''.join(parts)
+
+    def label(self, keyword):
+        if self.random.random() < self.noise_probability:
+            return keyword
+        return self.random.choice([keyword + ':', keyword, keyword + ': '])
+
+    def email(self):
+        local = self.word((1, 3)) + self.random.choice(['', '.', '_']) + self.word((1, 3))
+        domain = self.word((2, 6)) + '.' + self.random.choice(['com', 'net', 'org', 'au', 'io'])
+        value = f"{local}@{domain}"
+        # "email:" keeps the local part from running into the previous word
+        prefix = 'email' if self.random.random() < self.noise_probability else 'email:'
+        return value, prefix + value
+
+    def date(self):
+        day = self.random.randint(1, 28)
+        month = self.random.randint(0, 11)
+        year = self.random.randint(2020, 2026)
+        style = self.random.randrange(3)
+        if style == 0:
+            return f"{day}{MONTHS[month]}{year}"
+        if style == 1:
+            return f"{day:02d} {MONTHS[month]} {year}"
+        return f"{day}{MONTH_NAMES[month]}{year}"
+
+    def amount(self):
+        value = self.random.choice([0, self.random.randint(1, 999), self.random.randint(1000, 99999)])
+        cents = self.random.randint(0, 99)
+        return f"{value:,}.{cents:02d}" if value >= 1000 else f"{value}.{cents:02d}"
+
+    # (text, truth); redrawn until no keyword appears where two tokens happen to join (e.g. "gst" + "electrical")
+    def document(self, blocks=None):
+        while True:
+            text, truth, planted = self.draw_document(blocks)
+            if len(KEYWORDS.findall(text)) == planted:
+                return text, truth
+
+    def draw_document(self, blocks):
+        blocks = blocks or self.random.choice([4, 10, 30, 100, 400])  # About 100 bytes to 10 KB of filler
+        values = {
+            'email': self.email(),
+            'tel': (tel := self.digits(self.random.randint(8, 10)), self.label('tel') + tel),
+            'abn': (abn := self.digits(11), self.label('abn') + abn),
+            'due_date': (due := self.date(), self.label('duedate') + due),
+            'invoice_date': (issued := self.date(), self.label('invoicedate') + issued),
+            'amount_due': (owing := self.amount(), self.label('amountdue') + owing),
+            'amount_paid': (paid := self.amount(), self.label('amountpaid') + paid),
+        }
+
+        truth = {name: [] for name in FIELDS}
+        segments = []
+        for name in FIELDS:
+            if self.random.random() >= self.field_probability:
+                continue
+            value, segment = values[name]
+            truth[name].append(value)
+            segments.append(segment)
+            if self.random.random() < self.repeat_probability:
+                segments.append(segment)
+        self.random.shuffle(segments)
+
+        # Each field is followed by a word, so numbers never run into the next token
+        parts = [self.filler(self.random.randint(1, 3))]
+        per_gap = max(blocks // (len(segments) + 1), 1)
+        for segment in segments:
+            parts.append(segment)
+            parts.append(self.filler(per_gap))
+        return ''.join(parts), truth, len(segments)
+
+    def documents(self, count):
+        for _ in range(count):
+            yield self.document()
+
+    # (email, mobile, email_is_valid, mobile_is_valid) rows for the bulk validators
+    def contacts(self, count):
+        for _ in range(count):
+            email = f"{self.word((1, 3))}@{self.word((2, 4))}.com"
+            email_valid = True
+            style = self.random.randrange(8)
+            if style == 0:
+                email, email_valid = email.replace('@', ''), False
+            elif style == 1:
+                email, email_valid = email[:-4], False  # No TLD
+            elif style == 2:
+                email, email_valid = email.replace('@', ' @'), False
+            elif style == 3:
+                email = f"  {email.upper()} "  # Valid once normalized
+
+            mobile = self.digits(self.random.randint(10, 12))
+            mobile_valid = True
+            style = self.random.randrange(8)
+            if style == 0:
+                mobile, mobile_valid = mobile[:9], False
+            elif style == 1:
+                mobile, mobile_valid = mobile[:4] + 'x' + mobile[5:], False
+            elif style == 2:
+                mobile = f"+91 {mobile[:5]}-{mobile[5:]}"  # Valid once normalized
+            elif style == 3:
+                mobile, mobile_valid = '++' + mobile, False
+            yield email, mobile, email_valid, mobile_valid
+
+
+# Inputs built to make the current patterns backtrack or rescan as much as possible
+def adversarial_documents(size=5000):
+    return {
+        # No "@": the email pattern restarts its local-part run at every position (quadratic)
+        'letters_without_at': 'a' * size,
+        'letters_then_bare_at': 'a' * size + '@',
+        # The date's [A-Za-z]+ swallows everything, then gives it back letter by letter looking for a year
+        'date_letters_without_year': ('duedate1' + 'b' * 50) * (size // 58),
+        'date_spaces_without_month': 'duedate1' + ' ' * size + '2025',
+        # [0-9.,]+ runs to the end of a huge number-like token
+        'amount_long_token': 'amountdue' + '1,0.' * (size // 4),
+        'keyword_spam': 'amountdueamountpaidduedateinvoicedatetelabn' * (size // 43),
+        'labels_with_long_separators': 'tel' + ':' * size + 'abn' + ' ' * size,
+    }
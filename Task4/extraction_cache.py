@@ -0,0 +1,184 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import invoice_scanner
+from invoice_scanner import scan_lists
+
+
+# Hash of every pattern (source and flags) the scanner uses, including the anchors that decide where
+# it looks, and of the invoice_scanner source itself, so a change to the scanning or normalizing code
+# gives a new version too. Entries of other versions are dropped when the cache is opened.
+def extractor_version():
+    patterns = [invoice_scanner.ANCHORS, invoice_scanner.EMAIL, *invoice_scanner.FIELD_PATTERNS.values()]
+    spec = json.dumps([(pattern.pattern, pattern.flags) for pattern in patterns])
+    digest = hashlib.sha256(spec.encode())
+    with open(invoice_scanner.__file__, 'rb') as fh:
+        digest.update(fh.read())
+    return digest.hexdigest()[:16]
+
+
+# Leading/trailing whitespace can never be part of a match, so it is dropped before hashing
+def normalize(text):
+    return text.strip()
+
+
+# Persistent cache of scan_lists() results in a SQLite file, keyed by the SHA-256 of the normalized
+# text and the extractor version. Holds at most max_entries rows; the least recently used ones are
+# evicted. Recency updates of hits are written in batches, so a hit costs one hash and one lookup.
+# One instance can be shared by the threads of a process: its connection and counters are guarded by
+# a lock. Other processes must open their own instance (a connection must not cross a fork); `size`
+# then only counts this instance's inserts and is recounted from the table before evicting.
+class ExtractionCache:
+    TOUCH_BATCH = 1000  # Hits buffered before their last_used times are written
+
+    def __init__(self, path='extraction_cache.sqlite3', max_entries=100_000):
+        self.max_entries = max_entries
+        self.version = extractor_version()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.db.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS extractions (
+                key BLOB PRIMARY KEY,
+                version TEXT NOT NULL,
+                result TEXT NOT NULL,
+                last_used INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used);
+        """)
+        with self.db:
+            stale = self.db.execute("DELETE FROM extractions WHERE version != ?", [self.version]).rowcount
+        self.size = self.db.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        self.touched = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidated = stale
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.version}\0{normalize(text)}".encode()).digest()
+
+    def get(self, text, key=None):
+        key = key or self.key(text)
+        with self.lock:
+            row = self.db.execute("SELECT result FROM extractions WHERE key = ?", [key]).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.touched[key] = time.time_ns()
+            if len(self.touched) >= self.TOUCH_BATCH:
+                self._flush()
+        return json.loads(row[0])
+
+    # Only a new row grows `size`: an existing key (e.g. two threads missing the same text) is updated
+    def put(self, text, result, key=None):
+        key = key or self.key(text)
+        values = [self.version, json.dumps(result), time.time_ns(), key]
+        with self.lock:
+            with self.db:
+                inserted = self.db.execute(
+                    "INSERT INTO extractions (version, result, last_used, key) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO NOTHING",
+                    values,
+                ).rowcount
+                if not inserted:
+                    self.db.execute("UPDATE extractions SET version = ?, result = ?, last_used = ? WHERE key = ?", values)
+            self.size += inserted
+            if self.size > self.max_entries:
+                self._evict()
+
+    # Cached scan_lists(text)
+    def extract(self, text):
+        key = self.key(text)
+        result = self.get(text, key)
+        if result is None:
+            result = scan_lists(text)
+            self.put(text, result, key)
+        return result
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.touched:
+            with self.db:
+                self.db.executemany(
+                    "UPDATE extractions SET last_used = ? WHERE key = ?",
+                    [(used, key) for key, used in self.touched.items()],
+                )
+            self.touched = {}
+
+    # Drop the least recently used tenth of the cache, so eviction runs once per many inserts
+    def evict(self):
+        with self.lock:
+            self._evict()
+
+    def _evict(self):
+        self._flush()
+        self.size = self.db.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        excess = self.size - self.max_entries + self.max_entries // 10
+        if excess > 0:
+            with self.db:
+                deleted = self.db.execute(
+                    "DELETE FROM extractions WHERE key IN "
+                    "(SELECT key FROM extractions ORDER BY last_used LIMIT ?)",
+                    [excess],
+                ).rowcount
+            self.size -= deleted
+            self.evictions += deleted
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'version': self.version,
+                'entries': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidated': self.invalidated,
+            }
+
+    def close(self):
+        with self.lock:
+            self._flush()
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import timeit
+    from concurrent.futures import ThreadPoolExecutor
+    from Text_Extraction import value_extract, string
+
+    with tempfile.TemporaryDirectory() as directory:
+        with ExtractionCache(os.path.join(directory, 'cache.sqlite3')) as cache:
+            assert cache.extract(string) == value_extract(string)
+            cache.put(string, cache.extract(string))  # A replaced entry is not a new one
+            assert cache.stats()['entries'] == 1
+
+            number = 20000
+            for label, func in (('value_extract', value_extract), ('cache hit', cache.extract)):
+                seconds = min(timeit.repeat(lambda: func(string), number=number, repeat=5))
+                print(f"{label:14} {seconds / number * 1e6:8.2f} us/call")
+
+            # Shared by threads: concurrent misses of the same texts still leave one entry per text
+            texts = [f"{string}\nref {i % 50}" for i in range(400)]
+            with ThreadPoolExecutor(4) as pool:
+                assert list(pool.map(cache.extract, texts)) == [value_extract(text) for text in texts]
+            assert cache.stats()['entries'] == 51
+            print(cache.stats())
@@ -0,0 +1,128 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+# Same patterns as Text_Extraction.value_extract, compiled once at import.
+# Each keyword pattern is tried with .match() only where its keyword starts.
+DATE = r'([0-9]{1,2}\s*[A-Za-z]+\s*[0-9]{4})'
+AMOUNT = r'([0-9.,]+)'
+
+FIELD_PATTERNS = {
+    'tel': re.compile(r'tel[:\s]*([0-9]{6,15})', re.I),
+    'abn': re.compile(r'abn[:\s]*([0-9]{11})', re.I),
+    'duedate': re.compile(r'duedate[:\s]*' + DATE, re.I),
+    'invoicedate': re.compile(r'invoicedate[:\s]*' + DATE, re.I),
+    'amountdue': re.compile(r'amountdue[:\s]*' + AMOUNT, re.I),
+    'amountpaid': re.compile(r'amountpaid[:\s]*' + AMOUNT, re.I),
+}
+EMAIL = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z]+\.[A-Za-z]{2,3}', re.I)
+EMAIL_LOCAL_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-')
+
+# Zero-width, so keywords that start inside another keyword (e.g. "amountduedate") are still seen
+ANCHORS = re.compile(r'(?=(tel|abn|duedate|invoicedate|amountdue|amountpaid|@))', re.I)
+
+MONTH_NAMES = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+               'august', 'september', 'october', 'november', 'december']
+MONTHS = {name: number for number, name in enumerate(MONTH_NAMES, start=1)}
+MONTHS.update({name[:3]: number for name, number in MONTHS.items()})
+MONTHS['sept'] = 9
+DATE_PARTS = re.compile(r'([0-9]{1,2})\s*([A-Za-z]+)\s*([0-9]{4})')
+
+
+@dataclass
+class InvoiceFields:
+    emails: list = field(default_factory=list)
+    tels: list = field(default_factory=list)
+    abns: list = field(default_factory=list)
+    due_dates: list = field(default_factory=list)       # datetime.date
+    invoice_dates: list = field(default_factory=list)   # datetime.date
+    amounts_due: list = field(default_factory=list)     # Decimal
+    amounts_paid: list = field(default_factory=list)    # Decimal
+    unparsed: list = field(default_factory=list)        # (field, raw text) matches that are not a valid date/amount
+
+
+def parse_date(raw):
+    day, month, year = DATE_PARTS.fullmatch(raw).groups()
+    number = MONTHS.get(month.lower())
+    if number is None:
+        raise ValueError(raw)
+    return date(int(year), number, int(day))  # ValueError for e.g. 31feb2025
+
+
+def parse_amount(raw):
+    try:
+        return Decimal(raw.replace(',', ''))
+    except InvalidOperation:
+        raise ValueError(raw) from None
+
+
+# Raw matches per field in one pass over the text, in the order value_extract() returns them.
+# Gives exactly what re.findall() finds for each pattern: per field, matches start at or after
+# the end of that field's previous match.
+def scan_lists(text):
+    found = {name: [] for name in ('email', *FIELD_PATTERNS)}
+    last_end = dict.fromkeys(found, 0)
+
+    for anchor in ANCHORS.finditer(text):
+        position = anchor.start()
+        keyword = anchor.group(1).lower()
+
+        if keyword == '@':
+            # The earliest possible start of the local part: walk back over local-part characters
+            start = position
+            while start > last_end['email'] and text[start - 1] in EMAIL_LOCAL_CHARS:
+                start -= 1
+            if start == position:
+                continue
+            match = EMAIL.match(text, start)
+            if match:
+                found['email'].append(match.group())
+                last_end['email'] = match.end()
+            continue
+
+        if position < last_end[keyword]:
+            continue
+        match = FIELD_PATTERNS[keyword].match(text, position)
+        if match:
+            found[keyword].append(match.group(1))
+            last_end[keyword] = match.end()
+
+    return [found['email'], found['tel'], found['abn'], found['duedate'],
+            found['invoicedate'], found['amountdue'], found['amountpaid']]
+
+
+def scan(text):
+    email, tel, abn, due_date, invoice_date, amount_due, amount_paid = scan_lists(text)
+    result = InvoiceFields(emails=email, tels=tel, abns=abn)
+
+    for name, values, parse, target in (
+        ('due_date', due_date, parse_date, result.due_dates),
+        ('invoice_date', invoice_date, parse_date, result.invoice_dates),
+        ('amount_due', amount_due, parse_amount, result.amounts_due),
+        ('amount_paid', amount_paid, parse_amount, result.amounts_paid),
+    ):
+        for raw in values:
+            try:
+                target.append(parse(raw))
+            except ValueError:
+                result.unparsed.append((name, raw))
+
+    return result
+
+
+def benchmark(number=20000):
+    import timeit
+    from Text_Extraction import value_extract, string
+
+    assert scan_lists(string) == value_extract(string), "scanner disagrees with value_extract"
+
+    for label, func in (('value_extract', value_extract), ('scan_lists', scan_lists), ('scan', scan)):
+        seconds = min(timeit.repeat(lambda: func(string), number=number, repeat=5))
+        print(f"{label:14} {seconds / number * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    from Text_Extraction import string
+    print(scan(string))
+    benchmark()
@@ -0,0 +1,129 @@
+import mmap
+import re
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass
+
+# The value_extract patterns as bytes, with every repetition capped so no match is longer than
+# MAX_MATCH bytes (the caps are far above anything found in real invoices, where the results are the
+# same). A match can then only span a chunk boundary if it starts in the last MAX_MATCH bytes of what
+# has been read, and keeping that much as overlap is enough to find it exactly once.
+DATE = rb'([0-9]{1,2}\s{0,256}[A-Za-z]{1,256}\s{0,256}[0-9]{4})'
+AMOUNT = rb'([0-9.,]{1,256})'
+
+EMAIL_LOCAL_MAX = 1024
+EMAIL = re.compile(rb'[A-Za-z0-9._%+-]{1,1024}@[A-Za-z]{1,256}\.[A-Za-z]{2,3}', re.I)
+EMAIL_LOCAL_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-')
+
+PATTERNS = {
+    'email': EMAIL,
+    'tel': re.compile(rb'tel[:\s]{0,256}([0-9]{6,15})', re.I),
+    'abn': re.compile(rb'abn[:\s]{0,256}([0-9]{11})', re.I),
+    'due_date': re.compile(rb'duedate[:\s]{0,256}' + DATE, re.I),
+    'invoice_date': re.compile(rb'invoicedate[:\s]{0,256}' + DATE, re.I),
+    'amount_due': re.compile(rb'amountdue[:\s]{0,256}' + AMOUNT, re.I),
+    'amount_paid': re.compile(rb'amountpaid[:\s]{0,256}' + AMOUNT, re.I),
+}
+MAX_MATCH = 2048  # >= the longest possible match of any pattern above (email: 1024 + 1 + 256 + 1 + 3)
+
+
+@dataclass(frozen=True)
+class StreamMatch:
+    field: str
+    value: str
+    start: int  # Byte offset of the value in the file
+    end: int
+
+
+# Email matches in the same order as EMAIL.finditer(), but only tried where an "@" is: the match
+# starts at the earliest local-part byte before it. Avoids retrying the local-part repetition from
+# every byte of long letter runs, which is what makes the email pattern the slowest by far.
+def find_emails(buffer, pos, endpos):
+    at = buffer.find(b'@', pos, endpos)
+    while at != -1:
+        start = at
+        while start > pos and at - start < EMAIL_LOCAL_MAX and buffer[start - 1] in EMAIL_LOCAL_BYTES:
+            start -= 1
+        match = EMAIL.match(buffer, start, endpos) if start < at else None
+        if match:
+            yield match
+            pos = match.end()
+        at = buffer.find(b'@', max(at + 1, pos), endpos)
+
+
+# Matches of every pattern that start before `limit`, searching buffer[:endpos]. `next_pos` holds, per
+# field, the absolute offset where its search resumes (the end of its previous match, like findall)
+# and is advanced past `limit`.
+# Offsets are those of the value, which can lie up to MAX_MATCH bytes after the start of the match
+# ("duedate" and spaces before the date), so a match of the next window can have a smaller offset.
+# Only values starting before `limit` are returned; later ones wait in `pending` (kept sorted) until a
+# window's limit passes them, which keeps the output in offset order across windows.
+def scan_window(buffer, base, limit, endpos, next_pos, pending):
+    found = pending[:]
+    for name, pattern in PATTERNS.items():
+        pos = next_pos[name] - base
+        matches = find_emails(buffer, pos, endpos) if pattern is EMAIL else pattern.finditer(buffer, pos, endpos)
+        for match in matches:
+            if match.start() >= limit:
+                break
+            group = 1 if pattern.groups else 0
+            start, end = match.span(group)
+            found.append(StreamMatch(name, match.group(group).decode('ascii'), base + start, base + end))
+            pos = match.end()
+        next_pos[name] = base + max(pos, limit)
+    found.sort(key=lambda match: (match.start, match.end, match.field))  # The same order whatever the windows
+    ready = bisect_left(found, base + limit, key=lambda match: match.start)
+    pending[:] = found[ready:]
+    return found[:ready]
+
+
+# Yield matches in offset order while reading the file in fixed-size chunks. Only the last MAX_MATCH
+# bytes (plus one chunk) are held in memory.
+def stream_extract(fh, chunk_size=1 << 20):
+    next_pos = dict.fromkeys(PATTERNS, 0)
+    pending = []
+    buffer = b''
+    base = 0  # File offset of buffer[0]
+
+    while True:
+        chunk = fh.read(chunk_size)
+        buffer += chunk
+        eof = not chunk
+        limit = len(buffer) if eof else max(len(buffer) - MAX_MATCH, 0)
+        yield from scan_window(buffer, base, limit, len(buffer), next_pos, pending)
+        if eof:
+            return
+        keep = min(next_pos.values()) - base  # Never past `limit`, so at most MAX_MATCH bytes are kept
+        buffer = buffer[keep:]
+        base += keep
+
+
+# Same as stream_extract, but searches the memory-mapped file in place instead of copying chunks
+def mmap_extract(path, chunk_size=1 << 20):
+    with open(path, 'rb') as fh:
+        if not fh.seek(0, 2):
+            return  # mmap cannot map an empty file
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            next_pos = dict.fromkeys(PATTERNS, 0)
+            pending = []
+            size = len(mapped)
+            limit = 0
+            while limit < size:
+                limit = min(limit + chunk_size, size)
+                yield from scan_window(mapped, 0, limit, min(limit + MAX_MATCH, size), next_pos, pending)
+
+
+def extract_file(path, use_mmap=False, chunk_size=1 << 20):
+    if use_mmap:
+        yield from mmap_extract(path, chunk_size)
+    else:
+        with open(path, 'rb') as fh:
+            yield from stream_extract(fh, chunk_size)
+
+
+# python stream_extract.py [--mmap] dump.txt ...  ->  start, end, field, value per line
+if __name__ == "__main__":
+    use_mmap = '--mmap' in sys.argv
+    for path in (arg for arg in sys.argv[1:] if arg != '--mmap'):
+        for match in extract_file(path, use_mmap):
+            print(f"{match.start}\t{match.end}\t{match.field}\t{match.value}")
@@ -14,8 +14,13 @@ from pathlib import Path
 from datetime import timedelta
 import environ
 import os
+import sys
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = BASE_DIR.parent.parent  # Training tasks root, so the apps can import e.g. Task4.Text_Extraction
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
 
 # Initialize environment variables
 env = environ.Env()
@@ -120,6 +125,7 @@ INSTALLED_APPS = [
     "rest_framework",# Django REST Framework for building APIs
     # 'rest_framework.authtoken',
     "usermangement", # Custom app handling user management features
+    "invoices", # Invoice field extraction API built on Task4.Text_Extraction
 ]
 
 MIDDLEWARE = [
@@ -163,10 +169,41 @@ WSGI_APPLICATION = "DjangoCrud.wsgi.application" # WSGI application entry point
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": env("SQLITE_PATH", default=str(BASE_DIR / "db.sqlite3")),
+        "OPTIONS": {
+            "timeout": 20,  # Seconds SQLite's busy handler waits for the write lock before "database is locked"
+            "transaction_mode": "IMMEDIATE",  # Take the write lock at BEGIN instead of failing when a read upgrades to a write
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"  # Readers no longer block the writer (and vice versa)
+                "PRAGMA synchronous=NORMAL;"  # Safe with WAL, fsync only at checkpoints
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA cache_size=-20000;"  # ~20 MB page cache per connection
+                "PRAGMA wal_autocheckpoint=1000;"
+            ),
+        },
     }
 }
 
+# Write contention handling for the views decorated with util.sqlite_writes.sqlite_write
+SQLITE_BUSY_RETRIES = 5         # Extra attempts when a write transaction still hits "database is locked"
+SQLITE_BUSY_BACKOFF = 0.05      # Base backoff in seconds (jittered, doubled per attempt)
+SQLITE_SERIALIZED_WRITES = env.bool("SQLITE_SERIALIZED_WRITES", default=False)  # Funnel writes through one connection per process
+
+# Cache
+# Local-memory by default; point CACHE_URL at a shared backend (e.g. redis://...) when running several workers
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+PROFILE_CACHE_ALIAS = "default"  # Cache alias holding serialized view_profile payloads
+PROFILE_CACHE_TIMEOUT = 300  # Seconds a cached profile payload lives without being invalidated
+
+# Long-polling of GET /api/changes/?wait=<seconds>. A waiting request holds a worker thread and a
+# database connection for the whole wait, so it is off (0) unless enabled here; keep it well below the
+# worker timeout (e.g. gunicorn's 30 s) and size the worker pool for the number of waiting consumers.
+CHANGES_MAX_WAIT = env.int("CHANGES_MAX_WAIT", default=0)  # Seconds; ?wait= is capped to this
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -217,15 +254,29 @@ REST_FRAMEWORK = {
 # Use SMTP backend for live emails
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 
-# SMTP server details
-EMAIL_HOST = 'smtp.gmail.com'          # Gmail SMTP server
-EMAIL_PORT = 587                       # TLS port
-EMAIL_USE_TLS = True                   # Use TLS for security
+# SMTP server details (override EMAIL_HOST/EMAIL_PORT/EMAIL_USE_TLS to test against a local debugging server)
+EMAIL_HOST = env("EMAIL_HOST", default='smtp.gmail.com')          # Gmail SMTP server
+EMAIL_PORT = env.int("EMAIL_PORT", default=587)                    # TLS port
+EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=True)            # Use TLS for security
 
 # Load email credentials from environment variables
 EMAIL_HOST_USER = env("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD")
 
+# Pooled SMTP delivery (util/mailer.py)
+MAILER_POOL_SIZE = 2          # Long-lived authenticated SMTP connections
+MAILER_BATCH_SIZE = 50        # Max messages a connection takes from the queue at once
+MAILER_FLUSH_INTERVAL = 0.05  # Seconds to wait for more queued messages before sending a batch
+MAILER_IDLE_TIMEOUT = 60      # Close connections idle for longer than this (seconds)
+MAILER_SEND_TIMEOUT = 30      # Seconds a request waits for its email to be delivered
+
+# Invoice extraction (invoices app)
+INVOICE_WORKERS = env.int("INVOICE_WORKERS", default=2)  # Worker processes running value_extract
+INVOICE_CHUNK_SIZE = 25        # Documents sent to a worker process per task
+INVOICE_INLINE_LIMIT = 10      # Batches up to this size are answered in the request, larger ones become jobs
+INVOICE_INLINE_TIMEOUT = 30    # Seconds an inline batch may take before the request fails
+INVOICE_MAX_DOCUMENTS = 1000   # Max documents per upload
+
 SIMPLE_JWT = {
     "USER_ID_FIELD": "id",
     "USER_ID_CLAIM": "user_id",
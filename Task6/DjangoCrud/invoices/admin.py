@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import ExtractionJob
+
+
+@admin.register(ExtractionJob)
+class ExtractionJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'created_by', 'status', 'processed', 'total', 'created_at', 'finished_at']
+    list_filter = ['status']
+    list_select_related = ['created_by']
+    raw_id_fields = ['created_by']
@@ -0,0 +1,131 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from util.sqlite_writes import retry_on_busy
+
+from .models import ExtractionJob, ExtractionDocument
+from .worker import extract_chunk
+
+logger = logging.getLogger(__name__)
+
+INVOICE_WORKERS = getattr(settings, 'INVOICE_WORKERS', 2)  # Worker processes running value_extract
+INVOICE_CHUNK_SIZE = getattr(settings, 'INVOICE_CHUNK_SIZE', 25)  # Documents per task sent to a worker
+
+
+# Runs value_extract in a pool of worker processes, so CPU-bound regex work neither blocks the
+# request threads nor competes with them for the GIL. Small batches are awaited by the request
+# (extract); large ones are stored as an ExtractionJob and processed by a background thread (start_job)
+# that writes each chunk's results as soon as it completes. The thread dies with the process, so jobs
+# it leaves pending/running are picked up by the recover_invoice_jobs command.
+class ExtractionPool:
+    def __init__(self, workers=INVOICE_WORKERS, chunk_size=INVOICE_CHUNK_SIZE):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # "spawn" because forking a multi-threaded server process can leave locks held in the child
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    # A worker of `executor` died (e.g. killed by the OS); start a fresh pool for the next batch. Every
+    # future of the broken pool reports it, so only the first call for that pool replaces it: a later
+    # one must not shut down (and cancel the work of) a pool another request has created since.
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    # Returns the executor the chunks went to and {future: start index of its chunk}
+    def _submit(self, texts):
+        executor = self._get_executor()
+        return executor, {
+            executor.submit(extract_chunk, texts[start:start + self.chunk_size]): start
+            for start in range(0, len(texts), self.chunk_size)
+        }
+
+    # Extract a small batch and wait for it; returns [(fields, error), ...] in input order. On a timeout
+    # the chunks not yet started are cancelled, so an abandoned request does not keep the workers busy.
+    def extract(self, texts, timeout):
+        deadline = time.monotonic() + timeout
+        results = [None] * len(texts)
+        executor, futures = self._submit(texts)
+        try:
+            for future, start in futures.items():
+                chunk = future.result(timeout=max(deadline - time.monotonic(), 0))
+                results[start:start + len(chunk)] = chunk
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return results
+
+    def start_job(self, job_id):
+        thread = threading.Thread(target=self.run_job, args=(job_id,), name=f"invoice-job-{job_id}", daemon=True)
+        thread.start()
+        return thread
+
+    def run_job(self, job_id):
+        try:
+            documents = list(
+                ExtractionDocument.objects.filter(job_id=job_id, fields__isnull=True, error='').values_list('pk', 'text')
+            )
+            ExtractionJob.objects.filter(pk=job_id).update(status=ExtractionJob.STATUS_RUNNING)
+
+            pks = [pk for pk, _ in documents]
+            executor, futures = self._submit([text for _, text in documents])
+            for future in as_completed(futures):
+                start = futures[future]
+                chunk_pks = pks[start:start + self.chunk_size]
+                try:
+                    results = future.result()
+                except BrokenProcessPool as exc:
+                    self._reset(executor)
+                    results = [(None, f"Worker process failed: {exc}"[:255])] * len(chunk_pks)
+                save_results(job_id, chunk_pks, results)
+
+            finish_job(job_id, ExtractionJob.STATUS_DONE)
+        except Exception:
+            logger.exception("Invoice extraction job %s failed", job_id)
+            finish_job(job_id, ExtractionJob.STATUS_FAILED)
+        finally:
+            connection.close()  # This thread's connection is not managed by the request cycle
+
+
+@retry_on_busy
+@transaction.atomic
+def save_results(job_id, pks, results):
+    documents = [
+        ExtractionDocument(pk=pk, fields=fields, error=error)
+        for pk, (fields, error) in zip(pks, results)
+    ]
+    ExtractionDocument.objects.bulk_update(documents, ['fields', 'error'])
+    ExtractionJob.objects.filter(pk=job_id).update(processed=F('processed') + len(documents))
+
+
+# The uploaded texts are only needed until the job ends (the results stay), so they are dropped here
+# instead of being kept forever
+@retry_on_busy
+@transaction.atomic
+def finish_job(job_id, status):
+    ExtractionJob.objects.filter(pk=job_id).update(status=status, finished_at=timezone.now())
+    ExtractionDocument.objects.filter(job_id=job_id).exclude(text='').update(text='')
+
+
+extraction_pool = ExtractionPool()  # Process-wide pool shared by the invoice views
@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from invoices.extraction import extraction_pool, finish_job
+from invoices.models import ExtractionJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Resume extraction jobs left pending/running by a process that stopped (restart, crash), or mark "
+        "them failed. Run it before starting the server; against a live server, use --older-than so jobs "
+        "that are still being processed are left alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fail', action='store_true', help="Mark the jobs failed instead of resuming them.")
+        parser.add_argument('--older-than', type=int, default=0, help="Only jobs created more than this many minutes ago.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        stale = list(ExtractionJob.objects.filter(
+            status__in=[ExtractionJob.STATUS_PENDING, ExtractionJob.STATUS_RUNNING], created_at__lte=cutoff,
+        ).values_list('pk', flat=True))
+
+        for job_id in stale:
+            if options['fail']:
+                finish_job(job_id, ExtractionJob.STATUS_FAILED)
+            else:
+                # Only the documents without a result are sent to the workers again
+                extraction_pool.run_job(job_id)
+            job = ExtractionJob.objects.get(pk=job_id)
+            self.stdout.write(f"Job {job_id}: {job.status} ({job.processed}/{job.total}).")
+        self.stdout.write(f"Recovered {len(stale)} job(s).")
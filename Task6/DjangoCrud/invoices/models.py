@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import models
+
+
+# A batch of uploaded documents processed in the background; polled through invoices/jobs/<id>/
+class ExtractionJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='extraction_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    total = models.PositiveIntegerField()  # Number of documents in the batch
+    processed = models.PositiveIntegerField(default=0)  # Documents with a result (or error) so far
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Job {self.pk} ({self.status}, {self.processed}/{self.total})"
+
+
+# One uploaded document of a job and its extracted fields
+class ExtractionDocument(models.Model):
+    job = models.ForeignKey(ExtractionJob, on_delete=models.CASCADE, related_name='documents')
+    position = models.PositiveIntegerField()  # Order of the document in the upload
+    name = models.CharField(max_length=255, blank=True)
+    text = models.TextField()
+    fields = models.JSONField(null=True, blank=True)  # value_extract() result, None until processed
+    error = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ['position']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'position'], name='extraction_document_job_position_uniq'),
+        ]
+
+    def __str__(self):
+        return self.name or f"Document {self.position}"
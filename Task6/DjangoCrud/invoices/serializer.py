@@ -0,0 +1,36 @@
+from django.conf import settings
+from rest_framework import serializers
+from util.base_serializer import BaseModelSerializer, BaseSerializerSerializer
+from .models import ExtractionJob, ExtractionDocument
+
+INVOICE_MAX_DOCUMENTS = getattr(settings, 'INVOICE_MAX_DOCUMENTS', 1000)  # Max documents per upload
+
+
+# Serializer for validating a batch of documents: [{"name": "...", "text": "..."}, ...]
+class InvoiceExtractSerializer(BaseSerializerSerializer):
+    documents = serializers.ListField(allow_empty=False, max_length=INVOICE_MAX_DOCUMENTS)
+
+    def validate_documents(self, value):
+        documents = []
+        for document in value:
+            if not isinstance(document, dict) or not isinstance(document.get('text'), str):
+                raise serializers.ValidationError("documents_invalid")
+            name = document.get('name') or ''
+            if not isinstance(name, str) or len(name) > 255:
+                raise serializers.ValidationError("documents_invalid")
+            documents.append({'name': name, 'text': document['text']})
+        return documents
+
+
+# Serializer for extraction job status
+class ExtractionJobSerializer(BaseModelSerializer):
+    class Meta:
+        model = ExtractionJob
+        fields = ['id', 'status', 'total', 'processed', 'created_at', 'finished_at']
+
+
+# Serializer for the extracted fields of one document
+class ExtractionDocumentSerializer(BaseModelSerializer):
+    class Meta:
+        model = ExtractionDocument
+        fields = ['position', 'name', 'fields', 'error']
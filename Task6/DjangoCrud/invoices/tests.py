@@ -0,0 +1,153 @@
+import time
+from concurrent.futures import Future
+from io import StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from usermangement.models import User
+from . import views
+from .extraction import ExtractionPool
+from .models import ExtractionJob, ExtractionDocument
+
+INVOICE_TEXT = (
+    "paymentadviceto:allhourselectricalwaabn:54788190299tel:92752839"
+    "email:service@allhourselectricalwa.com.auinvoicenumberinv-3649amountdue0.00duedate4jan2025"
+    "invoicedate4jan2025lessamountpaid167.81"
+)
+
+
+class InvoiceExtractTests(TestCase):
+    """Small batches are extracted in the worker pool and answered in the request."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='billing@example.com', password='Secret@123')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_inline_batch_returns_fields_per_document(self):
+        response = self.client.post(reverse('extract_invoices'), {
+            'documents': [{'name': 'inv-3649.txt', 'text': INVOICE_TEXT}, {'text': 'no invoice here'}],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        first, second = response.data['data']['documents']
+        self.assertEqual(first['name'], 'inv-3649.txt')
+        self.assertEqual(first['fields']['abn'], ['54788190299'])
+        self.assertEqual(first['fields']['amount_paid'], ['167.81'])
+        self.assertEqual(first['fields']['due_date'], ['4jan2025'])
+        self.assertEqual(second['fields']['email'], [])
+        self.assertEqual(ExtractionJob.objects.count(), 0)
+
+    def test_accepts_uploaded_text_files(self):
+        upload = SimpleUploadedFile('inv-3649.txt', INVOICE_TEXT.encode())
+        response = self.client.post(reverse('extract_invoices'), {'files': [upload]}, format='multipart')
+
+        self.assertEqual(response.status_code, 200)
+        document = response.data['data']['documents'][0]
+        self.assertEqual(document['name'], 'inv-3649.txt')
+        self.assertEqual(document['fields']['invoice_date'], ['4jan2025'])
+
+    def test_rejects_empty_batch(self):
+        response = self.client.post(reverse('extract_invoices'), {'documents': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('documents', response.data['errors'])
+
+    def test_timeout_cancels_outstanding_chunks(self):
+        futures = {Future(): 0, Future(): 25}  # Chunks still queued in the pool
+        pool = ExtractionPool()
+        with mock.patch.object(pool, '_submit', return_value=(None, futures)):
+            with self.assertRaises(TimeoutError):
+                pool.extract([INVOICE_TEXT] * 50, timeout=0.01)
+        self.assertTrue(all(future.cancelled() for future in futures))
+
+    def test_stale_broken_pool_does_not_reset_the_new_one(self):
+        pool = ExtractionPool()
+        broken, current = mock.Mock(), mock.Mock()
+        pool._executor = current  # Created by another request after `broken` failed
+        pool._reset(broken)
+        current.shutdown.assert_not_called()
+        self.assertIs(pool._executor, current)
+
+        pool._reset(current)
+        current.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        self.assertIsNone(pool._executor)
+
+
+class InvoiceJobTests(TransactionTestCase):
+    """Large batches become jobs processed by a background thread and polled for results."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='billing@example.com', password='Secret@123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_large_batch_is_processed_as_a_job(self):
+        documents = [{'name': f"doc{i}", 'text': INVOICE_TEXT} for i in range(views.INVOICE_INLINE_LIMIT + 5)]
+        response = self.client.post(reverse('extract_invoices'), {'documents': documents}, format='json')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['data']['job']['id']
+
+        deadline = time.monotonic() + 30
+        while True:
+            response = self.client.get(reverse('invoice_job', args=[job_id]))
+            if response.data['data']['job']['status'] in ('done', 'failed') or time.monotonic() > deadline:
+                break
+            time.sleep(0.1)
+
+        job = response.data['data']['job']
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['processed'], len(documents))
+        results = response.data['data']['documents']
+        self.assertEqual([result['name'] for result in results], [document['name'] for document in documents])
+        self.assertTrue(all(result['fields']['tel'] == ['92752839'] for result in results))
+
+        # Other users cannot see the job
+        other = User.objects.create_user(email='other@example.com', password='Secret@123')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(reverse('invoice_job', args=[job_id])).status_code, 404)
+
+
+class RecoverInvoiceJobsTests(TransactionTestCase):
+    """Jobs orphaned by a stopped process are resumed from their unprocessed documents, or failed."""
+
+    def setUp(self):
+        user = User.objects.create_user(email='billing@example.com', password='Secret@123')
+        # Interrupted after the first document: status still running, no thread left to finish it
+        self.job = ExtractionJob.objects.create(created_by=user, total=3, processed=1, status=ExtractionJob.STATUS_RUNNING)
+        ExtractionDocument.objects.bulk_create([
+            ExtractionDocument(job=self.job, position=0, text=INVOICE_TEXT, fields={'tel': ['0']}),
+            ExtractionDocument(job=self.job, position=1, text=INVOICE_TEXT),
+            ExtractionDocument(job=self.job, position=2, text=INVOICE_TEXT),
+        ])
+        ExtractionJob.objects.create(created_by=user, total=0, status=ExtractionJob.STATUS_DONE)
+
+    def test_resumes_unfinished_documents(self):
+        out = StringIO()
+        call_command('recover_invoice_jobs', stdout=out)
+
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.processed), (ExtractionJob.STATUS_DONE, 3))
+        self.assertEqual([document.fields['tel'] for document in self.job.documents.all()],
+                         [['0'], ['92752839'], ['92752839']])  # The finished document is not redone
+        self.assertIn("Recovered 1 job(s).", out.getvalue())
+        self.assertFalse(self.job.documents.exclude(text='').exists())  # Texts are dropped once the job ends
+
+    def test_fail_marks_jobs_failed(self):
+        call_command('recover_invoice_jobs', fail=True, stdout=StringIO())
+
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.processed), (ExtractionJob.STATUS_FAILED, 1))
+        self.assertIsNotNone(self.job.finished_at)
+
+    def test_older_than_skips_recent_jobs(self):
+        out = StringIO()
+        call_command('recover_invoice_jobs', older_than=60, stdout=out)
+        self.assertIn("Recovered 0 job(s).", out.getvalue())
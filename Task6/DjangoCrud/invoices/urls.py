@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('extract/', views.extract_invoices, name='extract_invoices'),
+    path('jobs/<int:pk>/', views.invoice_job, name='invoice_job'),
+]
@@ -0,0 +1,101 @@
+from concurrent.futures.process import BrokenProcessPool  # Raised when a worker process dies mid-batch
+from django.conf import settings
+from django.db import transaction  # For atomic database transactions
+from rest_framework import status  # HTTP status codes
+from rest_framework.decorators import api_view, permission_classes, parser_classes  # Decorators for API views and permission control
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser  # Parsers for file uploads and JSON batches
+from rest_framework.permissions import IsAuthenticated  # Permission classes for API endpoints
+from util.responses import APIResponse  # Standardized API response utility
+from util.sqlite_writes import sqlite_write  # Retries/serializes write transactions under SQLite lock contention
+
+from .extraction import extraction_pool  # Worker processes running value_extract
+from .models import ExtractionJob, ExtractionDocument
+from .serializer import InvoiceExtractSerializer, ExtractionJobSerializer, ExtractionDocumentSerializer
+
+INVOICE_INLINE_LIMIT = getattr(settings, 'INVOICE_INLINE_LIMIT', 10)  # Larger batches become background jobs
+INVOICE_INLINE_TIMEOUT = getattr(settings, 'INVOICE_INLINE_TIMEOUT', 30)  # Seconds an inline batch may take
+
+
+# Store a large batch as a job; processing starts once the rows are committed
+@sqlite_write
+@transaction.atomic
+def create_job(user, documents):
+    job = ExtractionJob.objects.create(created_by=user, total=len(documents))
+    ExtractionDocument.objects.bulk_create(
+        ExtractionDocument(job=job, position=position, name=document['name'], text=document['text'])
+        for position, document in enumerate(documents)
+    )
+    transaction.on_commit(lambda: extraction_pool.start_job(job.pk))
+    return job
+
+
+# Extract invoice fields from a batch of documents (only authenticated users can access)
+# Send text files as multipart "files", or JSON {"documents": [{"name": ..., "text": ...}]}.
+# Small batches are answered directly; larger ones return a job to poll at jobs/<id>/
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser, JSONParser])
+def extract_invoices(request):
+    if request.FILES:
+        data = {'documents': [
+            {'name': upload.name, 'text': upload.read().decode('utf-8', errors='replace')}
+            for upload in request.FILES.getlist('files')
+        ]}
+    else:
+        data = request.data
+    serializer = InvoiceExtractSerializer(data=data)
+
+    if not serializer.is_valid():
+        return APIResponse.get_validation_error_response(
+            return_code=APIResponse.Codes.VALIDATION_ERROR,
+            serializer_errors=serializer.errors
+        )
+
+    documents = serializer.validated_data['documents']
+    if len(documents) > INVOICE_INLINE_LIMIT:
+        job = create_job(request.user, documents)
+        return APIResponse.get_success_response(
+            return_code=APIResponse.Codes.INVOICE_JOB_CREATED,
+            data={'job': ExtractionJobSerializer(job).data},
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
+    try:
+        results = extraction_pool.extract([document['text'] for document in documents], timeout=INVOICE_INLINE_TIMEOUT)
+    except (TimeoutError, BrokenProcessPool):
+        return APIResponse.get_error_response(
+            return_code=APIResponse.Codes.INVOICE_EXTRACTION_FAILED,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    return APIResponse.get_success_response(
+        return_code=APIResponse.Codes.INVOICES_EXTRACTED,
+        data={'documents': [
+            {'position': position, 'name': document['name'], 'fields': fields, 'error': error}
+            for position, (document, (fields, error)) in enumerate(zip(documents, results))
+        ]},
+        status_code=status.HTTP_200_OK
+    )
+
+
+# Get the status of an extraction job and the documents processed so far (job owner or admin)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def invoice_job(request, pk):
+    jobs = ExtractionJob.objects.all() if request.user.is_staff else ExtractionJob.objects.filter(created_by=request.user)
+    job = jobs.filter(pk=pk).first()
+    if job is None:
+        return APIResponse.get_error_response(
+            return_code=APIResponse.Codes.INVOICE_JOB_NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    documents = job.documents.exclude(fields__isnull=True, error='').defer('text')  # Finished documents only
+    return APIResponse.get_success_response(
+        return_code=APIResponse.Codes.INVOICE_JOB_RETRIEVED,
+        data={
+            'job': ExtractionJobSerializer(job).data,
+            'documents': ExtractionDocumentSerializer(documents, many=True).data,
+        },
+        status_code=status.HTTP_200_OK
+    )
@@ -0,0 +1,16 @@
+# Code run inside the extraction worker processes. Kept free of Django imports so the
+# spawned workers start quickly and never open database connections.
+from Task4.Text_Extraction import value_extract
+
+FIELD_NAMES = ['email', 'tel', 'abn', 'due_date', 'invoice_date', 'amount_due', 'amount_paid']  # Order of value_extract()'s result
+
+
+# Extract every text of a chunk; a failing document is reported as (None, error) instead of failing the chunk
+def extract_chunk(texts):
+    results = []
+    for text in texts:
+        try:
+            results.append((dict(zip(FIELD_NAMES, value_extract(text))), ''))
+        except Exception as exc:
+            results.append((None, str(exc)[:255]))
+    return results
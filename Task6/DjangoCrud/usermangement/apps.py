@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UsermangementConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "usermangement"
+
+    def ready(self):
+        from . import signals  # noqa: F401  Register User change-log receivers
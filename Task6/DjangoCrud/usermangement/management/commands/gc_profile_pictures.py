@@ -0,0 +1,124 @@
+import heapq
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from usermangement.models import User
+
+UPLOAD_DIR = User._meta.get_field('profile_picture').upload_to.rstrip('/')  # "profile_pics"
+
+
+def quarantine_dir():
+    return os.path.join(settings.MEDIA_ROOT, '.quarantine', UPLOAD_DIR)
+
+
+def cursor_file():
+    return os.path.join(settings.MEDIA_ROOT, '.gc_profile_pictures.json')
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete (or quarantine) profile pictures no user references any more. Files are visited in name "
+        "order in batches; the last visited name is saved so the next run resumes where this one stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24, help="Never touch files modified more recently than this.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Files checked against the database per query.")
+        parser.add_argument('--max-files', type=int, default=0, help="Stop after visiting this many files (0 = until the end).")
+        parser.add_argument('--quarantine', action='store_true', help="Move orphans to MEDIA_ROOT/.quarantine/ instead of deleting them.")
+        parser.add_argument('--dry-run', action='store_true', help="Report what would be reclaimed without changing anything.")
+        parser.add_argument('--reset', action='store_true', help="Ignore the saved cursor and start from the first file.")
+
+    def handle(self, *args, **options):
+        directory = default_storage.path(UPLOAD_DIR)
+        cursor = None if options['reset'] else self.load_cursor()
+        cutoff = time.time() - options['grace_hours'] * 3600
+        stats = {'visited': 0, 'referenced': 0, 'recent': 0, 'reclaimed_files': 0, 'reclaimed_bytes': 0}
+
+        names = self.names_after(directory, cursor, options['max_files'])
+        for start in range(0, len(names), options['batch_size']):
+            batch = names[start:start + options['batch_size']]
+
+            # Live references for this batch only, so the query stays bounded by the batch size
+            live = set(User.objects.filter(
+                profile_picture__in=[f"{UPLOAD_DIR}/{name}" for name in batch]
+            ).values_list('profile_picture', flat=True))
+
+            for name in batch:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.lstat(path)
+                except FileNotFoundError:
+                    continue  # Removed since the listing
+                stats['visited'] += 1
+                if f"{UPLOAD_DIR}/{name}" in live:
+                    stats['referenced'] += 1
+                elif stat.st_mtime > cutoff:
+                    stats['recent'] += 1  # May belong to an upload whose user row is not committed yet
+                else:
+                    if not options['dry_run']:
+                        self.remove(directory, name, options['quarantine'])
+                    stats['reclaimed_files'] += 1
+                    stats['reclaimed_bytes'] += stat.st_size
+
+            cursor = batch[-1]
+            if not options['dry_run']:
+                self.save_cursor(cursor)
+
+        if not options['max_files'] or len(names) < options['max_files']:
+            cursor = None  # Full pass finished, the next run starts over
+
+        if not options['dry_run']:
+            self.save_cursor(cursor)
+
+        action = 'would reclaim' if options['dry_run'] else ('quarantined' if options['quarantine'] else 'deleted')
+        self.stdout.write(
+            f"Visited {stats['visited']} file(s): {stats['referenced']} referenced, {stats['recent']} within grace period, "
+            f"{action} {stats['reclaimed_files']} ({stats['reclaimed_bytes']} bytes). "
+            f"Cursor: {cursor or 'start'}"
+        )
+
+    # The file names after the cursor in name order, from one pass over the directory: all of them, or
+    # only the `limit` smallest (heapq keeps just those in memory)
+    def names_after(self, directory, cursor, limit):
+        with os.scandir(directory) as entries:
+            names = (
+                entry.name for entry in entries
+                if entry.is_file(follow_symlinks=False) and (cursor is None or entry.name > cursor)
+            )
+            return heapq.nsmallest(limit, names) if limit else sorted(names)
+
+    def remove(self, directory, name, quarantine):
+        if quarantine:
+            os.makedirs(quarantine_dir(), exist_ok=True)
+            os.replace(os.path.join(directory, name), self.quarantine_path(name))
+        else:
+            default_storage.delete(f"{UPLOAD_DIR}/{name}")
+
+    # A free name in the quarantine: an earlier orphan with the same name gets a numbered sibling
+    # (avatar.jpg, avatar.1.jpg, ...) instead of being overwritten
+    def quarantine_path(self, name):
+        stem, extension = os.path.splitext(name)
+        path = os.path.join(quarantine_dir(), name)
+        counter = 0
+        while os.path.lexists(path):
+            counter += 1
+            path = os.path.join(quarantine_dir(), f"{stem}.{counter}{extension}")
+        return path
+
+    def load_cursor(self):
+        try:
+            with open(cursor_file()) as fh:
+                return json.load(fh).get('cursor')
+        except (OSError, ValueError):
+            return None
+
+    def save_cursor(self, cursor):
+        os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+        with open(cursor_file(), 'w') as fh:
+            json.dump({'cursor': cursor}, fh)
@@ -0,0 +1,37 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from usermangement.models import EmailVerificationOTP, PasswordResetOTP, OTP_VALIDITY
+
+
+class Command(BaseCommand):
+    help = "Delete expired email verification and password reset OTPs in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows deleted per transaction.")
+        parser.add_argument('--sleep', type=float, default=0.05, help="Seconds to pause between batches so live writes can get the lock.")
+        parser.add_argument(
+            '--older-than', type=int, default=int(OTP_VALIDITY.total_seconds() // 60),
+            help="Age in minutes after which an OTP is purged (defaults to the OTP validity).",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        for model in (EmailVerificationOTP, PasswordResetOTP):
+            deleted = self.purge(model, cutoff, options['batch_size'], options['sleep'])
+            self.stdout.write(f"{model.__name__}: deleted {deleted} expired row(s).")
+
+    def purge(self, model, cutoff, batch_size, sleep):
+        deleted = 0
+        while True:
+            # Index range scan on created_at, bounded by batch_size, keeps each transaction short
+            with transaction.atomic():
+                pks = list(model.objects.filter(created_at__lt=cutoff).values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    return deleted
+                deleted += model.objects.filter(pk__in=pks).delete()[0]
+            time.sleep(sleep)
@@ -0,0 +1,96 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from util.sqlite_writes import is_busy_error, sqlite_write
+
+
+# One read-modify-write transaction, the pattern that deadlocks under DEFERRED transactions
+def increment_counter(writer):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT value FROM stress_counter WHERE id = 1")
+        value = cursor.fetchone()[0]
+        cursor.execute("UPDATE stress_counter SET value = %s WHERE id = 1", [value + 1])
+        cursor.execute("INSERT INTO stress_event (writer, seen) VALUES (%s, %s)", [writer, value])
+
+
+class Command(BaseCommand):
+    help = (
+        "Run N concurrent writer processes against a scratch SQLite file using the project's "
+        "connection settings and report how many 'database is locked' errors reached the caller."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help="Concurrent writer processes.")
+        parser.add_argument('--writes', type=int, default=200, help="Transactions per writer.")
+        parser.add_argument('--baseline', action='store_true', help="Plain DEFERRED transactions without pragmas or retries, for comparison.")
+        parser.add_argument('--worker', type=int, default=None, help="Internal: run as writer number N.")
+
+    def handle(self, *args, **options):
+        if options['worker'] is not None:
+            return self.run_worker(options['worker'], options['writes'], options['baseline'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stress.sqlite3')
+            with sqlite3.connect(path) as db:
+                db.execute("CREATE TABLE stress_counter (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)")
+                db.execute("CREATE TABLE stress_event (id INTEGER PRIMARY KEY, writer INTEGER, seen INTEGER)")
+                db.execute("INSERT INTO stress_counter VALUES (1, 0)")
+
+            started = time.perf_counter()
+            processes = [self.spawn_worker(index, path, options) for index in range(options['writers'])]
+            results = [json.loads(process.communicate()[0]) for process in processes]
+            elapsed = time.perf_counter() - started
+
+            with sqlite3.connect(path) as db:
+                counter = db.execute("SELECT value FROM stress_counter").fetchone()[0]
+                events = db.execute("SELECT COUNT(*) FROM stress_event").fetchone()[0]
+
+        summary = {
+            'writers': options['writers'],
+            'attempted': options['writers'] * options['writes'],
+            'committed': events,
+            'counter': counter,
+            'lock_errors': sum(result['lock_errors'] for result in results),
+            'seconds': round(elapsed, 3),
+            'transactions_per_second': round(events / elapsed, 1),
+        }
+        self.stdout.write(json.dumps(summary))
+
+        if not options['baseline'] and (summary['lock_errors'] or counter != summary['attempted']):
+            raise CommandError(f"SQLite write contention not absorbed: {summary}")
+        return None
+
+    def spawn_worker(self, index, path, options):
+        command = [
+            sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'sqlite_stress',
+            '--worker', str(index), '--writes', str(options['writes']),
+        ]
+        if options['baseline']:
+            command.append('--baseline')
+        return subprocess.Popen(command, stdout=subprocess.PIPE, text=True, env={**os.environ, 'SQLITE_PATH': path})
+
+    def run_worker(self, index, writes, baseline):
+        if baseline:
+            connection.settings_dict['OPTIONS'] = {'timeout': 1}
+            write = transaction.atomic(increment_counter)
+        else:
+            write = sqlite_write(transaction.atomic(increment_counter))
+
+        lock_errors = 0
+        for _ in range(writes):
+            try:
+                write(index)
+            except Exception as exc:
+                if not is_busy_error(exc):
+                    raise
+                lock_errors += 1
+        self.stdout.write(json.dumps({'worker': index, 'lock_errors': lock_errors}))
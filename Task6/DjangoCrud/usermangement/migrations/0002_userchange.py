@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("usermangement", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserChange",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                ("user_id", models.BigIntegerField(db_index=True)),
+                (
+                    "op",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("deleted", "Deleted"),
+                        ],
+                        max_length=7,
+                    ),
+                ),
+                ("data", models.JSONField(blank=True, null=True)),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["seq"],
+            },
+        ),
+    ]
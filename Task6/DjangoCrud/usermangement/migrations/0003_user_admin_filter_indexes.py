@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("usermangement", "0002_userchange"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["is_verified"], name="user_is_verified_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["is_staff"], name="user_is_staff_idx"),
+        ),
+    ]
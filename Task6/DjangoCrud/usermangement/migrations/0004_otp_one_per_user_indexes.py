@@ -0,0 +1,54 @@
+# Generated by Django 5.2.9 on 2026-10-19 02:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def keep_latest_otp_per_user(apps, schema_editor):
+    # The tables become one-row-per-user: drop all but the newest OTP of each user first
+    for model_name in ("EmailVerificationOTP", "PasswordResetOTP"):
+        model = apps.get_model("usermangement", model_name)
+        latest = model.objects.values("user").annotate(latest=models.Max("id")).values("latest")
+        model.objects.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("usermangement", "0003_user_admin_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_otp_per_user, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="emailverificationotp",
+            name="user",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AlterField(
+            model_name="passwordresetotp",
+            name="user",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emailverificationotp",
+            index=models.Index(fields=["user", "otp"], name="email_otp_user_otp_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="emailverificationotp",
+            index=models.Index(fields=["created_at"], name="email_otp_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="passwordresetotp",
+            index=models.Index(fields=["user", "otp"], name="reset_otp_user_otp_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="passwordresetotp",
+            index=models.Index(fields=["created_at"], name="reset_otp_created_idx"),
+        ),
+    ]
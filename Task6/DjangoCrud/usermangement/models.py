@@ -2,6 +2,9 @@ from django.db import models  # Import Django's ORM models to define database ta
 from django.contrib.auth.models import AbstractUser, BaseUserManager  # AbstractUser for custom user model, BaseUserManager to manage users
 from phonenumber_field.modelfields import PhoneNumberField  # Custom field for storing phone numbers with validation
 import uuid  # To generate unique identifiers (used for password reset tokens)
+from datetime import timedelta
+
+OTP_VALIDITY = timedelta(minutes=10)  # How long an emailed OTP can be used
 
 class CustomUserManager(BaseUserManager):
     # Custom method to create a regular user
@@ -38,6 +41,12 @@ class User(AbstractUser):
 
     objects = CustomUserManager()  # Attach the custom user manager
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['is_verified'], name='user_is_verified_idx'),  # Admin list filter
+            models.Index(fields=['is_staff'], name='user_is_staff_idx'),  # Admin list filter
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.email}"  # String representation
 
@@ -52,19 +61,50 @@ class User(AbstractUser):
 
 
 class PasswordResetOTP(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    user = models.OneToOneField(User, on_delete=models.CASCADE)  # At most one pending OTP per user
     otp = models.CharField(max_length=6)  # 6-digit OTP
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'otp'], name='reset_otp_user_otp_idx'),  # OTP check on reset
+            models.Index(fields=['created_at'], name='reset_otp_created_idx'),  # Expiry purge
+        ]
+
     def __str__(self):
         return f"OTP for {self.user.email}"
 
 
 class EmailVerificationOTP(models.Model):
     """Model to store OTP for email verification during registration"""
-    user = models.ForeignKey(User, on_delete=models.CASCADE)  # Link OTP to user
+    user = models.OneToOneField(User, on_delete=models.CASCADE)  # Link OTP to user, at most one pending OTP each
     otp = models.CharField(max_length=6)  # 6-digit OTP for email verification
     created_at = models.DateTimeField(auto_now_add=True)  # Timestamp when OTP was created
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'otp'], name='email_otp_user_otp_idx'),  # OTP check on verification
+            models.Index(fields=['created_at'], name='email_otp_created_idx'),  # Expiry purge
+        ]
+
+    def __str__(self):
+        return f"Email Verification OTP for {self.user.email}"
+
+class UserChange(models.Model):
+    """Append-only log of User create/update/delete events, served by the changes/ feed"""
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    OP_CHOICES = [(CREATED, 'Created'), (UPDATED, 'Updated'), (DELETED, 'Deleted')]
+
+    seq = models.BigAutoField(primary_key=True)  # Monotonic cursor handed out to consumers
+    user_id = models.BigIntegerField(db_index=True)  # Plain id (not a FK) so entries outlive deleted users
+    op = models.CharField(max_length=7, choices=OP_CHOICES)
+    data = models.JSONField(null=True, blank=True)  # Public snapshot of the user, empty for deletes
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['seq']
+
     def __str__(self):
-        return f"Email Verification OTP for {self.user.email}"
\ No newline at end of file
+        return f"#{self.seq} {self.op} user {self.user_id}"
@@ -0,0 +1,87 @@
+import threading  # Locks for the hit/miss counters and per-key single-flight
+import weakref  # Per-key locks are dropped once no request is waiting on them
+from django.conf import settings
+from django.core.cache import caches
+
+PROFILE_CACHE_ALIAS = getattr(settings, 'PROFILE_CACHE_ALIAS', 'default')  # Any alias from CACHES (locmem by default)
+PROFILE_CACHE_TIMEOUT = getattr(settings, 'PROFILE_CACHE_TIMEOUT', 300)  # Seconds a serialized profile is kept
+
+
+# Cache of serialized profile payloads keyed by user id and revision.
+# Invalidation bumps the user's revision instead of deleting the payload, so a request that
+# serialized a stale user concurrently can only write under the old, no longer read, key.
+class ProfileCache:
+    def __init__(self, alias=PROFILE_CACHE_ALIAS, timeout=PROFILE_CACHE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0}
+        self._key_locks = weakref.WeakValueDictionary()
+        self._key_locks_guard = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _revision_key(self, user_id):
+        return f"profile:rev:{user_id}"
+
+    def _payload_key(self, user_id):
+        revision = self.cache.get(self._revision_key(user_id), 0)
+        return f"profile:{user_id}:{revision}"
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _lock_for(self, key):
+        with self._key_locks_guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._key_locks[key] = lock
+            return lock
+
+    # Return the cached payload for user_id, calling build() at most once per key at a time.
+    # build() must load the user itself: it runs after the revision is read, so a change committed
+    # later bumps the revision, but an object loaded before this call may already be stale.
+    def get_or_build(self, user_id, build):
+        key = self._payload_key(user_id)
+        payload = self.cache.get(key)
+        if payload is not None:
+            self._count('hits')
+            return payload
+
+        # Single-flight: concurrent misses on the same key wait for the first builder
+        with self._lock_for(key):
+            payload = self.cache.get(key)
+            if payload is not None:
+                self._count('coalesced')
+                return payload
+            self._count('misses')
+            payload = dict(build())
+            self.cache.set(key, payload, self.timeout)
+        return payload
+
+    # Move the user to a new revision so the next read rebuilds the payload
+    def invalidate(self, user_id):
+        key = self._revision_key(user_id)
+        # add() is a no-op when the key exists; incr() is atomic on shared backends
+        if not self.cache.add(key, 1, None):
+            try:
+                self.cache.incr(key)
+            except ValueError:  # Evicted between add() and incr()
+                self.cache.set(key, 1, None)
+        self._count('invalidations')
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+profile_cache = ProfileCache()  # Process-wide instance used by views and signals
@@ -1,7 +1,7 @@
 from rest_framework import serializers  # Import DRF serializers for converting model instances to JSON and validating input
-from .models import User    # Import the custom User model from current app
+from .models import User, UserChange    # Import the custom User model and change log from current app
 import re  # Regular expressions for password validation
-from util.base_serializer import BaseModelSerializer, BaseSerializerSerializer
+from util.base_serializer import BaseModelSerializer, BaseSerializerSerializer, get_readable_fields
 
 
 # Serializer for user model
@@ -155,4 +155,35 @@ class ResetPasswordSerializer(BaseSerializerSerializer):
     def validate(self, data):
         if data.get('new_password') != data.get('confirm_new_password'):
             raise serializers.ValidationError({"confirm_new_password": "Passwords do not match."})
-        return data
\ No newline at end of file
+        return data
+
+
+# Serializer for validating the changes feed query parameters
+class UserChangesQuerySerializer(BaseSerializerSerializer):
+    since = serializers.IntegerField(required=False, default=0, min_value=0)  # Last seq the consumer has applied
+    limit = serializers.IntegerField(required=False, default=500, min_value=1, max_value=1000)  # Max entries per page
+    wait = serializers.IntegerField(required=False, default=0, min_value=0, max_value=30)  # Long-poll timeout in seconds
+
+
+# Serializer for entries of the user change log
+class UserChangeSerializer(BaseModelSerializer):
+    class Meta:
+        model = UserChange
+        fields = ['seq', 'user_id', 'op', 'data', 'changed_at']
+
+
+# Serializer for validating the user export query parameters
+class ExportUsersQuerySerializer(BaseSerializerSerializer):
+    type = serializers.ChoiceField(choices=['ndjson', 'csv'], required=False, default='ndjson')  # Output encoding
+
+
+# Serializer for the ?fields= sparse fieldset parameter; pass the allowed names as context['allowed_fields']
+class SparseFieldsQuerySerializer(BaseSerializerSerializer):
+    fields = serializers.CharField(required=False)  # Comma separated field names, e.g. "id,email,is_verified"
+
+    def validate_fields(self, value):
+        allowed = self.context['allowed_fields']
+        requested = {name.strip() for name in value.split(',') if name.strip()}
+        if not requested or not requested.issubset(allowed):
+            raise serializers.ValidationError("fields_invalid")
+        return [name for name in allowed if name in requested]  # Keep the serializer's field order
@@ -0,0 +1,75 @@
+from django.db.models.signals import post_save, post_delete  # Model lifecycle signals
+from django.db import transaction
+from django.dispatch import receiver
+from .models import User, UserChange
+from .serializer import UserSerializer, UserProfileSerializer
+from .profile_cache import profile_cache
+
+# Fields exposed to downstream consumers; saves touching none of them (e.g. last_login on sign in) are not logged
+PUBLIC_FIELDS = frozenset(UserSerializer.Meta.fields) - {'password'}
+PROFILE_FIELDS = frozenset(UserProfileSerializer.Meta.fields)
+
+
+# Record every create/update of a user in the change log, inside the same transaction as the save
+@receiver(post_save, sender=User)
+def log_user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not created and update_fields is not None and not PUBLIC_FIELDS.intersection(update_fields):
+        return
+    UserChange.objects.create(
+        user_id=instance.pk,
+        op=UserChange.CREATED if created else UserChange.UPDATED,
+        data=UserSerializer(instance).data,
+    )
+
+
+# Record deletions so mirrors can drop the user without diffing the whole list
+@receiver(post_delete, sender=User)
+def log_user_deleted(sender, instance, **kwargs):
+    UserChange.objects.create(user_id=instance.pk, op=UserChange.DELETED)
+
+
+# Drop the cached view_profile payload whenever a profile field (including the picture file reference) changes
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_cache(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not PROFILE_FIELDS.intersection(update_fields):
+        return
+    user_id = instance.pk
+    profile_cache.invalidate(user_id)
+    # Invalidate again after commit so a payload built from pre-commit data is not served afterwards
+    transaction.on_commit(lambda: profile_cache.invalidate(user_id))
+
+
+BULK_LOG_BATCH = 500  # Users serialized and change-log rows inserted per batch by bulk_update_users
+
+
+# QuerySet.update() sends no signals, so bulk writers go through this instead: the change log is written
+# from the rows about to change (streamed and inserted BULK_LOG_BATCH at a time, with the new values
+# applied) and then the whole queryset is updated with one UPDATE. Call it inside a transaction so the
+# log and the update commit together. Returns the number of updated rows.
+def bulk_update_users(queryset, **values):
+    batch = []
+    for user in queryset.iterator(chunk_size=BULK_LOG_BATCH):
+        for name, value in values.items():
+            setattr(user, name, value)
+        batch.append(user)
+        if len(batch) == BULK_LOG_BATCH:
+            record_bulk_update(batch)
+            batch = []
+    if batch:
+        record_bulk_update(batch)
+    return queryset.update(**values)
+
+
+def record_bulk_update(users):
+    UserChange.objects.bulk_create(
+        UserChange(user_id=user.pk, op=UserChange.UPDATED, data=UserSerializer(user).data) for user in users
+    )
+    user_ids = [user.pk for user in users]
+    invalidate_profiles(user_ids)
+    transaction.on_commit(lambda: invalidate_profiles(user_ids))  # One callback per batch
+
+
+def invalidate_profiles(user_ids):
+    for user_id in user_ids:
+        profile_cache.invalidate(user_id)
@@ -1,3 +1,621 @@
-from django.test import TestCase
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.db import OperationalError, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from util.mailer import PooledMailer, mailer
+
+from .profile_cache import profile_cache
+from .signals import bulk_update_users
+from .models import User, UserChange, EmailVerificationOTP, PasswordResetOTP, OTP_VALIDITY
+
+# Rows in the user table for the scaled list tests, e.g. USER_TABLE_SCALE=10000 or 100000 (0 skips them)
+USER_TABLE_SCALE = int(os.environ.get('USER_TABLE_SCALE', '0'))
+
+PASSWORD = 'Rahul@123'
+NEW_PASSWORD = 'Rahul@456'
+
+
+# Fast hashing keeps the suite quick; the budgets are about the queries, not PBKDF2
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class EndpointBudgetTests(TestCase):
+    """Exact query budget for every route in usermangement/urls.py."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            'admin@example.com', PASSWORD, first_name='Admin', last_name='User'
+        )
+        cls.user = User.objects.create_user(
+            'rahul.sharma@example.com', PASSWORD, first_name='Rahul', last_name='Sharma',
+            address='123, MG Road', is_verified=True,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def login(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def registration_payload(self, email):
+        return {
+            'first_name': 'Priya', 'last_name': 'Patel', 'email': email, 'address': '456, Satellite Road',
+            'password': PASSWORD, 'confirm_password': PASSWORD,
+        }
+
+    # ---------------- Admin APIs ----------------
+
+    def test_getusers(self):
+        self.login(self.user)
+        with self.assertNumQueries(2):  # auth user, users list
+            response = self.client.get(reverse('get_users'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']['users']), 2)
+
+    def test_getusers_sparse_fields(self):
+        self.login(self.user)
+        with self.assertNumQueries(2) as queries:
+            response = self.client.get(reverse('get_users'), {'fields': 'is_verified,id,email'})
+        self.assertEqual(list(response.data['data']['users'][0]), ['id', 'email', 'is_verified'])
+        self.assertNotIn('"address"', queries.captured_queries[-1]['sql'])  # Unrequested columns are not selected
+
+    def test_getusers_sparse_fields_rejects_unknown(self):
+        self.login(self.user)
+        for fields in ('id,password', ',', 'nope'):
+            response = self.client.get(reverse('get_users'), {'fields': fields})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data['errors'], {'fields': ['fields_invalid']})
+
+    def test_adduser(self):
+        self.login(self.admin)
+        # auth, unique email, create (savepoint, insert, change log, release), verify (savepoint, update, change log, release)
+        with self.assertNumQueries(10):
+            response = self.client.post(reverse('add_user'), self.registration_payload('priya@example.com'), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(email='priya@example.com').is_verified)
+
+    def test_edituser(self):
+        self.login(self.admin)
+        with self.assertNumQueries(6):  # auth, user, savepoint, update, change log, release
+            response = self.client.patch(reverse('edit_user', args=[self.user.pk]), {'first_name': 'Rahul Kumar'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_edituser_not_found(self):
+        self.login(self.admin)
+        with self.assertNumQueries(2):  # auth, user
+            response = self.client.patch(reverse('edit_user', args=[0]), {'first_name': 'X'}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_update_password(self):
+        self.login(self.admin)
+        with self.assertNumQueries(6):  # auth, user, savepoint, update, change log, release
+            response = self.client.put(reverse('update_password', args=[self.user.pk]), {'new_password': NEW_PASSWORD}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete_user(self):
+        self.login(self.admin)
+        # auth, savepoint, user, cascade (extraction jobs, admin log, groups, permissions, both otp tables, user row),
+        # change log, release
+        with self.assertNumQueries(12):
+            response = self.client.delete(reverse('delete_user', args=[self.user.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+
+    def test_user_changes(self):
+        self.login(self.user)
+        with self.assertNumQueries(2):  # auth, change log page
+            response = self.client.get(reverse('user_changes'), {'since': 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']['changes']), 2)
+
+    def test_user_changes_wait_is_capped(self):
+        self.login(self.user)
+        since = UserChange.objects.latest('seq').seq
+        with mock.patch('usermangement.views.CHANGES_MAX_WAIT', 0):
+            with self.assertNumQueries(2):  # wait=30 returns at once, long-polling is off
+                response = self.client.get(reverse('user_changes'), {'since': since, 'wait': 30})
+        self.assertEqual(response.data['data']['changes'], [])
+
+        with mock.patch('usermangement.views.CHANGES_MAX_WAIT', 1), mock.patch('usermangement.views.CHANGES_POLL_INTERVAL', 0.2):
+            started = time.monotonic()
+            response = self.client.get(reverse('user_changes'), {'since': since, 'wait': 30})
+        self.assertLess(time.monotonic() - started, 2)  # Held for the 1 s cap, not 30 s
+        self.assertEqual(response.data['data']['next_since'], since)
+
+    def test_export_users(self):
+        self.login(self.admin)
+        for export_type, lines in (('ndjson', 2), ('csv', 3)):
+            with self.assertNumQueries(2):  # auth, one chunked users read
+                response = self.client.get(reverse('export_users'), {'type': export_type})
+                body = b''.join(response.streaming_content).decode()
+            self.assertEqual(len(body.splitlines()), lines)
+
+    # ---------------- Authentication APIs ----------------
+
+    def test_sign_up(self):
+        # unique email, user write (savepoint, insert, change log, release),
+        # otp write (savepoint, update_or_create: savepoint, select, savepoint, insert, 2 releases, release)
+        with self.assertNumQueries(13):
+            response = self.client.post(reverse('signup'), self.registration_payload('priya@example.com'), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_sign_up_sends_email_outside_the_write_transactions(self):
+        connection = transaction.get_connection()
+        depth = len(connection.atomic_blocks)  # The test case's own transactions
+        send = mailer.send
+        depths = []
+
+        def record_depth(message):
+            depths.append(len(connection.atomic_blocks))
+            return send(message)
+
+        with mock.patch.object(mailer, 'send', side_effect=record_depth):
+            response = self.client.post(reverse('signup'), self.registration_payload('priya@example.com'), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(depths, [depth])
+
+    def test_verify_email(self):
+        EmailVerificationOTP.objects.create(user=self.user, otp='123456')
+        with self.assertNumQueries(7):  # savepoint, user, otp, update, change log, otp delete, release
+            response = self.client.post(reverse('verify_email'), {'email': self.user.email, 'otp': '123456'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_sign_in(self):
+        # user, session exists check + insert (savepoint pair), last_login update, session update (savepoint pair)
+        with self.assertNumQueries(9):
+            response = self.client.post(reverse('signin'), {'email': self.user.email, 'password': PASSWORD}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.data['data'])
+
+    def test_sign_in_invalid_credentials(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('signin'), {'email': self.user.email, 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_sign_out(self):
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('signout'))
+        self.assertEqual(response.status_code, 200)
+
+    # ---------------- User Profile APIs ----------------
+
+    def test_view_profile(self):
+        self.login(self.user)
+        with self.assertNumQueries(2):  # auth, user re-read for the payload
+            response = self.client.get(reverse('view_profile'))
+        self.assertEqual(response.data['data']['user']['email'], self.user.email)
+        with self.assertNumQueries(1):  # auth only; the payload itself is cached
+            self.client.get(reverse('view_profile'))
+
+    def test_view_profile_does_not_cache_a_stale_user_under_a_new_revision(self):
+        self.login(self.user)
+        # Another request updates the profile after authentication loaded the user but before the payload is built
+        authenticate = JWTAuthentication.authenticate
+
+        def authenticate_then_update(auth, request):
+            result = authenticate(auth, request)
+            User.objects.filter(pk=self.user.pk).update(address='456, Nehru Place')
+            profile_cache.invalidate(self.user.pk)
+            return result
+
+        with mock.patch.object(JWTAuthentication, 'authenticate', authenticate_then_update):
+            response = self.client.get(reverse('view_profile'))
+        self.assertEqual(response.data['data']['user']['address'], '456, Nehru Place')
+        response = self.client.get(reverse('view_profile'))
+        self.assertEqual(response.data['data']['user']['address'], '456, Nehru Place')
+
+    def test_view_profile_sparse_fields(self):
+        self.login(self.user)
+        response = self.client.get(reverse('view_profile'), {'fields': 'email,id'})
+        self.assertEqual(response.data['data']['user'], {'id': self.user.pk, 'email': self.user.email})
+
+    def test_edit_profile(self):
+        self.login(self.user)
+        with self.assertNumQueries(5):  # auth, savepoint, update, change log, release
+            response = self.client.patch(reverse('edit_profile'), {'address': '456, Nehru Place'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_edit_profile_picture_is_stored_before_the_write(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        image = BytesIO()
+        Image.new('RGB', (1, 1)).save(image, 'PNG')
+        self.login(self.user)
+
+        picture = SimpleUploadedFile('me.png', image.getvalue(), content_type='image/png')
+        with mock.patch('usermangement.views.save_serializer', side_effect=OperationalError('disk I/O error')):
+            with self.assertRaises(OperationalError):
+                self.client.patch(reverse('edit_profile'), {'profile_picture': picture}, format='multipart')
+        self.assertEqual(os.listdir(os.path.join(media.name, 'profile_pics')), [])  # Removed with the failed write
+
+        picture = SimpleUploadedFile('me.png', image.getvalue(), content_type='image/png')
+        response = self.client.patch(reverse('edit_profile'), {'profile_picture': picture}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture.name, 'profile_pics/me.png')
+        self.assertEqual(os.listdir(os.path.join(media.name, 'profile_pics')), ['me.png'])
+
+    # ---------------- Password Management APIs ----------------
+
+    def test_change_password(self):
+        self.login(self.user)
+        payload = {'old_password': PASSWORD, 'new_password': NEW_PASSWORD, 'confirm_new_password': NEW_PASSWORD}
+        with self.assertNumQueries(5):  # auth, savepoint, update, change log, release
+            response = self.client.post(reverse('change_password'), payload, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_forget_password(self):
+        with self.assertNumQueries(7):  # user, otp update_or_create (savepoint, select, savepoint, insert, 2 releases)
+            response = self.client.post(reverse('forget_password'), {'email': self.user.email}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_forget_password_unknown_email(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('forget_password'), {'email': 'nobody@example.com'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_reset_password(self):
+        PasswordResetOTP.objects.create(user=self.user, otp='654321')
+        payload = {'email': self.user.email, 'otp': '654321', 'new_password': NEW_PASSWORD, 'confirm_new_password': NEW_PASSWORD}
+        # user from the link, user by email, otp, savepoint, update, change log, otp delete, release
+        with self.assertNumQueries(8):
+            response = self.client.post(reverse('reset_password', args=[self.user.pk]), payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password(NEW_PASSWORD))
+
+    def test_reset_password_email_mismatch(self):
+        PasswordResetOTP.objects.create(user=self.user, otp='654321')
+        payload = {'email': self.admin.email, 'otp': '654321', 'new_password': NEW_PASSWORD, 'confirm_new_password': NEW_PASSWORD}
+        with self.assertNumQueries(3):  # user from the link, user by email, otp (none for that user)
+            response = self.client.post(reverse('reset_password', args=[self.user.pk]), payload, format='json')
+        self.assertEqual(response.data['return_code'], 'OTP_INVALID')
+
+
+@skipUnless(USER_TABLE_SCALE, "set USER_TABLE_SCALE=10000 (or 100000) to run list endpoints at realistic sizes")
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ScaledUserTableTests(TestCase):
+    """List endpoints must keep a constant query count as the user table grows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reader@example.com', PASSWORD, first_name='Read', last_name='Er', is_verified=True)
+        User.objects.bulk_create(
+            (
+                User(email=f"user{i}@example.com", first_name='User', last_name=str(i), address='Somewhere', is_verified=True)
+                for i in range(USER_TABLE_SCALE - 1)
+            ),
+            batch_size=5000,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_getusers_at_scale(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('get_users'))
+        self.assertEqual(len(response.data['data']['users']), USER_TABLE_SCALE)
+
+    def test_export_users_at_scale(self):
+        self.user.is_staff = True
+        self.user.save(update_fields=['is_staff'])
+        with self.assertNumQueries(2):  # auth, one cursor read in chunks
+            response = self.client.get(reverse('export_users'), {'type': 'csv'})
+            rows = sum(chunk.count(b'\n') for chunk in response.streaming_content)
+        self.assertEqual(rows, USER_TABLE_SCALE + 1)
+
+    def test_user_changes_at_scale(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('user_changes'), {'since': 0, 'limit': 1000})
+        self.assertEqual(response.status_code, 200)
+
+
+class OTPTableTests(TestCase):
+    """One OTP row per user and batched purging of expired rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = User.objects.bulk_create(
+            User(email=f"otp{i}@example.com", first_name='Otp', last_name=str(i)) for i in range(5)
+        )
+
+    def test_update_or_create_keeps_one_row_per_user(self):
+        user = self.users[0]
+        EmailVerificationOTP.objects.update_or_create(user=user, defaults={'otp': '111111'})
+        EmailVerificationOTP.objects.update_or_create(user=user, defaults={'otp': '222222'})
+        self.assertEqual(EmailVerificationOTP.objects.get(user=user).otp, '222222')
+
+    def test_purge_expired_otps_in_batches(self):
+        expired = timezone.now() - OTP_VALIDITY - timedelta(minutes=1)
+        for user in self.users[:4]:
+            EmailVerificationOTP.objects.create(user=user, otp='123456')
+            PasswordResetOTP.objects.create(user=user, otp='654321')
+        EmailVerificationOTP.objects.filter(user__in=self.users[:3]).update(created_at=expired)
+        PasswordResetOTP.objects.filter(user__in=self.users[:2]).update(created_at=expired)
+
+        out = StringIO()
+        call_command('purge_expired_otps', batch_size=2, sleep=0, stdout=out)
+
+        self.assertEqual(EmailVerificationOTP.objects.count(), 1)
+        self.assertEqual(PasswordResetOTP.objects.count(), 2)
+        self.assertIn("EmailVerificationOTP: deleted 3", out.getvalue())
+
+
+class UserAdminTests(TestCase):
+    """Bulk actions and search of the user admin stay on indexes and bounded queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin@example.com', PASSWORD, first_name='Admin', last_name='User')
+        cls.pending = [
+            User.objects.create_user(f'pending{i}@example.com', PASSWORD, first_name='P', last_name='U')
+            for i in range(5)
+        ]
+        cls.mixed = User.objects.create_user('John.Doe@Example.com', PASSWORD, first_name='John', last_name='Doe')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_mark_verified_updates_once_and_logs_in_batches(self):
+        since = UserChange.objects.latest('seq').seq
+        queryset = User.objects.filter(email__startswith='pending', is_verified=False)
+        # 1 SELECT streamed through the iterator, 3 change-log INSERTs of up to 2 rows, 1 UPDATE
+        with mock.patch('usermangement.signals.BULK_LOG_BATCH', 2), transaction.atomic():
+            with self.assertNumQueries(5):
+                updated = bulk_update_users(queryset, is_verified=True)
+
+        self.assertEqual(updated, 5)
+        changes = UserChange.objects.filter(seq__gt=since)
+        self.assertEqual(sorted(change.user_id for change in changes), sorted(user.pk for user in self.pending))
+        self.assertTrue(all(change.data['is_verified'] for change in changes))
+
+    def test_mark_verified_action(self):
+        response = self.client.post(reverse('admin:usermangement_user_changelist'), {
+            'action': 'mark_verified', 'select_across': '1', '_selected_action': [self.pending[0].pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(User.objects.filter(is_verified=False).exists())  # "Select all" covers every page
+
+    def test_search_finds_mixed_case_emails(self):
+        changelist = reverse('admin:usermangement_user_changelist')
+        for term, expected in (('John.Doe', ['John.Doe@example.com']), ('pending3', ['pending3@example.com']),
+                               ('PENDING3', ['pending3@example.com']), (str(self.admin.pk), ['admin@example.com'])):
+            response = self.client.get(changelist, {'q': term})
+            self.assertEqual([user.email for user in response.context['cl'].result_list], expected, term)
+
+
+class SQLiteWriteContentionTests(SimpleTestCase):
+    """Concurrent writer processes must not surface "database is locked" with the SQLite connection layer."""
+
+    def test_concurrent_writers_get_no_lock_errors(self):
+        out = StringIO()
+        call_command('sqlite_stress', writers=6, writes=30, stdout=out)
+        summary = json.loads(out.getvalue())
+        self.assertEqual(summary['lock_errors'], 0)
+        self.assertEqual(summary['counter'], 6 * 30)  # No lost read-modify-write updates
+
+
+class ProfilePictureGCTests(TestCase):
+    """Orphaned profile pictures are reclaimed after the grace period; referenced and fresh files stay."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.pictures = os.path.join(media.name, 'profile_pics')
+        os.makedirs(self.pictures)
+        old = time.time() - 48 * 3600
+        for name in ('a.jpg', 'b.jpg', 'c.jpg', 'd.jpg', 'e.jpg'):
+            with open(os.path.join(self.pictures, name), 'wb') as fh:
+                fh.write(b'x' * 10)
+            if name != 'e.jpg':
+                os.utime(os.path.join(self.pictures, name), (old, old))  # e.jpg is a fresh upload
+        User.objects.create(email='pic@example.com', profile_picture='profile_pics/b.jpg')
+
+    def test_deletes_only_old_unreferenced_files(self):
+        out = StringIO()
+        call_command('gc_profile_pictures', batch_size=2, stdout=out)
+        self.assertEqual(sorted(os.listdir(self.pictures)), ['b.jpg', 'e.jpg'])
+        self.assertIn("deleted 3 (30 bytes)", out.getvalue())
+
+    def test_resumes_from_cursor_and_quarantines(self):
+        call_command('gc_profile_pictures', max_files=2, quarantine=True, stdout=StringIO())
+        self.assertEqual(sorted(os.listdir(self.pictures)), ['b.jpg', 'c.jpg', 'd.jpg', 'e.jpg'])
+
+        out = StringIO()
+        call_command('gc_profile_pictures', quarantine=True, stdout=out)  # Continues after b.jpg
+        self.assertIn("Visited 3 file(s)", out.getvalue())
+        self.assertEqual(sorted(os.listdir(self.pictures)), ['b.jpg', 'e.jpg'])
+        quarantine = os.path.join(os.path.dirname(self.pictures), '.quarantine', 'profile_pics')
+        self.assertEqual(sorted(os.listdir(quarantine)), ['a.jpg', 'c.jpg', 'd.jpg'])
+
+    def test_quarantine_keeps_earlier_files_with_the_same_name(self):
+        call_command('gc_profile_pictures', quarantine=True, stdout=StringIO())
+        for name in ('a.jpg', 'a.1.jpg'):  # a.jpg uploaded again, and orphaned again
+            path = os.path.join(self.pictures, 'a.jpg')
+            with open(path, 'wb') as fh:
+                fh.write(name.encode())
+            os.utime(path, (0, 0))
+            call_command('gc_profile_pictures', quarantine=True, reset=True, stdout=StringIO())
+
+        quarantine = os.path.join(os.path.dirname(self.pictures), '.quarantine', 'profile_pics')
+        self.assertEqual(sorted(os.listdir(quarantine)), ['a.1.jpg', 'a.2.jpg', 'a.jpg', 'c.jpg', 'd.jpg'])
+        with open(os.path.join(quarantine, 'a.jpg'), 'rb') as fh:
+            self.assertEqual(fh.read(), b'x' * 10)  # The first one was not overwritten
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Minimal in-process SMTP server that records what it accepts and can refuse or drop on demand."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPSinkHandler)
+        self.lock = threading.Lock()
+        self.messages = []  # (recipients, body) of every message received
+        self.connections = 0
+        self.mail_commands = 0
+        self.refuse = set()  # Recipients answered with 550
+        self.drop_at_mail = set()  # Close the connection on these MAIL commands (0-based, counted across connections)
+        self.drop_after_data = set()  # Record these messages, then close without replying
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        sink = self.server
+        with sink.lock:
+            sink.connections += 1
+        self.reply('220 sink ESMTP')
+        recipients = []
+        while line := self.rfile.readline():
+            command = line.decode().strip().split(' ', 1)[0].upper()
+            if command in ('EHLO', 'HELO', 'RSET', 'NOOP'):
+                recipients = []
+                self.reply('250 sink')
+            elif command == 'MAIL':
+                with sink.lock:
+                    number = sink.mail_commands
+                    sink.mail_commands += 1
+                if number in sink.drop_at_mail:
+                    return
+                recipients = []
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                address = line.decode().split(':', 1)[1].strip().strip('<>')
+                if address in sink.refuse:
+                    self.reply('550 No such user')
+                else:
+                    recipients.append(address)
+                    self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                body = []
+                while (data := self.rfile.readline()) not in (b'.\r\n', b''):
+                    body.append(data)
+                with sink.lock:
+                    number = len(sink.messages)
+                    sink.messages.append((recipients, b''.join(body)))
+                if number in sink.drop_after_data:
+                    return
+                self.reply('250 OK queued')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class PooledMailerSMTPTests(SimpleTestCase):
+    """util.mailer against a real SMTP conversation: per-message results, reconnects, metrics."""
+
+    def setUp(self):
+        self.sink = SMTPSink()
+        threading.Thread(target=self.sink.serve_forever, daemon=True).start()
+        self.addCleanup(self.sink.server_close)
+        self.addCleanup(self.sink.shutdown)
+        self.enterContext(override_settings(
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=self.sink.server_address[1], EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='', EMAIL_TIMEOUT=5,
+        ))
+        # One connection and a long flush window, so the queued messages form a single batch
+        self.mailer = PooledMailer(pool_size=1, batch_size=10, flush_interval=0.2, idle_timeout=5,
+                                   backend='django.core.mail.backends.smtp.EmailBackend')
+        self.addCleanup(self.mailer.close)
+
+    def send(self, *recipients, subject='OTP'):
+        futures = [
+            self.mailer.send(EmailMessage(subject, 'code', 'noreply@example.com', [recipient]))
+            for recipient in recipients
+        ]
+        return [self.outcome(future) for future in futures]
+
+    def outcome(self, future):
+        try:
+            return future.result(timeout=10)
+        except Exception as exc:
+            return type(exc).__name__
+
+    def test_batch_shares_one_connection(self):
+        results = self.send('a@example.com', 'b@example.com', 'c@example.com')
+
+        self.assertEqual(results, [1, 1, 1])
+        self.assertEqual([recipients for recipients, _ in self.sink.messages],
+                         [['a@example.com'], ['b@example.com'], ['c@example.com']])
+        self.assertEqual(self.sink.connections, 1)
+        [metrics] = self.mailer.metrics()
+        self.assertEqual((metrics['sent'], metrics['batches'], metrics['failures'], metrics['reconnects']),
+                         (3, 1, 0, 0))
+
+    def test_refused_recipient_fails_only_its_message(self):
+        self.sink.refuse.add('gone@example.com')
+        results = self.send('a@example.com', 'gone@example.com', 'c@example.com')
+
+        self.assertEqual(results, [1, 'SMTPRecipientsRefused', 1])
+        self.assertEqual(len(self.sink.messages), 2)
+        self.assertEqual(self.sink.connections, 1)  # smtplib reset the session, the connection stayed
+        self.assertEqual(self.mailer.metrics()[0]['failures'], 1)
+
+    def test_reconnects_after_drop_without_duplicates(self):
+        self.sink.drop_at_mail.add(1)  # The second message's first attempt
+        results = self.send('a@example.com', 'b@example.com', 'c@example.com')
+
+        self.assertEqual(results, [1, 1, 1])
+        self.assertEqual([recipients for recipients, _ in self.sink.messages],
+                         [['a@example.com'], ['b@example.com'], ['c@example.com']])
+        self.assertEqual(self.sink.connections, 2)
+        [metrics] = self.mailer.metrics()
+        self.assertEqual((metrics['sent'], metrics['failures'], metrics['reconnects']), (3, 0, 1))
+
+    def test_drop_after_data_is_not_resent(self):
+        self.sink.drop_after_data.add(1)  # The server has the second message but never confirms it
+        results = self.send('a@example.com', 'b@example.com', 'c@example.com')
+
+        self.assertEqual(results, [1, 'SMTPServerDisconnected', 1])
+        self.assertEqual(len(self.sink.messages), 3)  # b@ once, not twice
+        self.assertEqual(self.mailer.metrics()[0]['reconnects'], 0)
+
+    def test_bad_message_does_not_stop_the_worker(self):
+        results = self.send('a@example.com') + self.send('b@example.com', subject='bad\nheader')
+        results += self.send('c@example.com')
+
+        self.assertEqual(results, [1, 'BadHeaderError', 1])
+        self.assertTrue(self.mailer._workers[0].is_alive())
+
+    def test_dead_worker_is_replaced(self):
+        self.assertEqual(self.send('a@example.com'), [1])
+        worker = self.mailer._workers[0]
+        self.mailer._queue.put(None)  # Stops the worker as if it had died
+        worker.join(timeout=10)
+
+        self.assertEqual(self.send('b@example.com'), [1])
+        self.assertIsNot(self.mailer._workers[0], worker)
+        self.assertEqual(self.mailer.metrics()[0]['sent'], 2)
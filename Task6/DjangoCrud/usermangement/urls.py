@@ -8,6 +8,8 @@ urlpatterns = [
     path('edituser/<int:pk>/', views.edituser, name='edit_user'),
     path('deleteuser/<int:pk>/', views.del_user, name='delete_user'),
     path('updatepassword/<int:pk>/', views.update_password, name='update_password'),
+    path('changes/', views.user_changes, name='user_changes'),
+    path('exportusers/', views.export_users, name='export_users'),
 
     # Authentication APIs
     path('signup/', views.sign_up, name='signup'),
@@ -1,5 +1,5 @@
 from django.contrib.auth import authenticate, login, logout  # Functions for user authentication and session management
-from django.core.mail import send_mail  # Function to send emails
+from util.mailer import mailer, MAILER_SEND_TIMEOUT  # Pooled SMTP sender for outgoing emails
 from django.conf import settings  # Access Django settings (e.g., EMAIL_HOST_USER)
 from django.utils import timezone  # Import timezone for OTP timestamp
 from rest_framework.decorators import api_view, permission_classes, parser_classes  # Decorators for API views and permission control
@@ -8,10 +8,12 @@ from rest_framework.response import Response  # Standard API response object
 from rest_framework import status  # HTTP status codes
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser  # Parsers for handling file uploads
 from django.db import transaction  # For atomic database transactions
+from util.sqlite_writes import sqlite_write  # Retries/serializes write transactions under SQLite lock contention
 from rest_framework.authentication import TokenAuthentication  # Token-based authentication
 from rest_framework.decorators import authentication_classes  # Token-based authentication
 from rest_framework_simplejwt.tokens import RefreshToken  # JWT token management
 import random
+import time
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode 
@@ -19,8 +21,8 @@ from rest_framework.authentication import SessionAuthentication, BasicAuthentica
 from util.sent_otp import send_otp  # Utility function to send OTP emails
 from util.responses import create_response  # Utility function to create standardized API responses
 
-from datetime import timedelta
-from .models import User, PasswordResetOTP, EmailVerificationOTP  # Import custom User model and OTP models
+from .profile_cache import profile_cache  # Per-user cache of serialized profiles
+from .models import User, PasswordResetOTP, EmailVerificationOTP, UserChange, OTP_VALIDITY  # Import custom User model, OTP models and change log
 from .serializer import (
     UserSerializer, 
     RegistrationSerializer,
@@ -30,9 +32,65 @@ from .serializer import (
     LoginSerializer,
     ChangePasswordSerializer,
     ForgotPasswordSerializer, 
-    ResetPasswordSerializer
+    ResetPasswordSerializer,
+    UserChangesQuerySerializer,
+    UserChangeSerializer,
+    ExportUsersQuerySerializer,
+    SparseFieldsQuerySerializer
 )
+from util.base_serializer import get_readable_fields
 from util.responses import APIResponse # Standardized API response utility
+from util.exports import ndjson_lines, csv_lines, buffered  # Row-by-row encoders for streamed exports
+from django.http import StreamingHttpResponse  # Response streamed while rows are read
+
+CHANGES_POLL_INTERVAL = 0.5  # Seconds between change log checks while long-polling
+CHANGES_MAX_WAIT = getattr(settings, 'CHANGES_MAX_WAIT', 0)  # Cap on ?wait=; 0 disables long-polling
+USER_READ_FIELDS = get_readable_fields(UserSerializer)  # Names accepted by ?fields= on getusers/
+PROFILE_READ_FIELDS = get_readable_fields(UserProfileSerializer)  # Names accepted by ?fields= on viewprofile/
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched from the database per round trip during exports
+EXPORT_FIELDS = [
+    'id', 'email', 'first_name', 'last_name', 'address', 'phone_number', 'profile_picture',
+    'is_verified', 'is_active', 'is_staff', 'date_joined', 'last_login',
+]
+
+
+# Short write transactions for the views below. The rest of a view (validation, password hashing,
+# storing uploads, sending email) runs outside them, so with SQLITE_SERIALIZED_WRITES the writer thread
+# only runs queries and a busy retry repeats nothing but the writes.
+@sqlite_write
+@transaction.atomic
+def save_serializer(serializer, **kwargs):
+    return serializer.save(**kwargs)
+
+
+@sqlite_write
+@transaction.atomic
+def save_user(user, used_otp=None):
+    user.save()
+    if used_otp is not None:
+        used_otp.delete()  # The OTP goes in the same transaction as the password it changed
+
+
+@sqlite_write
+@transaction.atomic
+def delete_otp(otp_obj):
+    otp_obj.delete()
+
+
+# Save a validated user serializer. An uploaded profile picture is written to storage first and only its
+# name is saved with the row; the file is removed again if the save fails.
+def save_user_serializer(serializer, **kwargs):
+    upload = serializer.validated_data.get('profile_picture')
+    if not upload:
+        return save_serializer(serializer, **kwargs)
+    field = User._meta.get_field('profile_picture')
+    name = field.storage.save(field.generate_filename(None, upload.name), upload, max_length=field.max_length)
+    serializer.validated_data['profile_picture'] = name
+    try:
+        return save_serializer(serializer, **kwargs)
+    except BaseException:
+        field.storage.delete(name)
+        raise
 
 
 
@@ -41,8 +99,20 @@ from util.responses import APIResponse # Standardized API response utility
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def getusers(request):
+    # Optional ?fields=id,email,... limits both the selected columns and the serialized keys
+    query = SparseFieldsQuerySerializer(data=request.query_params, context={'allowed_fields': USER_READ_FIELDS})
+
+    if not query.is_valid():
+        return APIResponse.get_validation_error_response(
+            return_code=APIResponse.Codes.VALIDATION_ERROR,
+            serializer_errors=query.errors
+        )
+
+    fields = query.validated_data.get('fields')  # None means all fields
     users = User.objects.all()  # Fetch all users
-    serializer = UserSerializer(users, many=True)  # Serialize list of users
+    if fields:
+        users = users.only(*fields)
+    serializer = UserSerializer(users, many=True, only_fields=fields)  # Serialize list of users
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.USERS_LIST_RETRIEVED,
         data={'users': serializer.data},
@@ -50,11 +120,77 @@ def getusers(request):
     )
 
 
+# Incremental feed of user changes after a cursor (only authenticated users can access)
+# Consumers pass the last seq they applied as ?since= and receive only the newer entries;
+# with ?wait=<seconds> the request is held open until a change arrives or the timeout passes. Waiting
+# ties up a worker thread and a DB connection, so the wait is capped at CHANGES_MAX_WAIT (off by default).
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_changes(request):
+    serializer = UserChangesQuerySerializer(data=request.query_params)
+
+    if not serializer.is_valid():
+        return APIResponse.get_validation_error_response(
+            return_code=APIResponse.Codes.VALIDATION_ERROR,
+            serializer_errors=serializer.errors
+        )
+
+    since = serializer.validated_data['since']
+    limit = serializer.validated_data['limit']
+    deadline = time.monotonic() + min(serializer.validated_data['wait'], CHANGES_MAX_WAIT)
+
+    while True:
+        # Fetch one extra row to know whether the consumer should page again immediately
+        changes = list(UserChange.objects.filter(seq__gt=since)[:limit + 1])
+        if changes or time.monotonic() >= deadline:
+            break
+        time.sleep(CHANGES_POLL_INTERVAL)
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    return APIResponse.get_success_response(
+        return_code=APIResponse.Codes.USER_CHANGES_RETRIEVED,
+        data={
+            'changes': UserChangeSerializer(changes, many=True).data,
+            'next_since': changes[-1].seq if changes else since,
+            'has_more': has_more,
+        },
+        status_code=status.HTTP_200_OK
+    )
+
+
+# Export all users as NDJSON or CSV (Admin only)
+# Rows are read in chunks with a server-side iterator and encoded one by one, so memory stays flat
+# regardless of table size and the first bytes are sent before the whole table is read.
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_users(request):
+    serializer = ExportUsersQuerySerializer(data=request.query_params)
+
+    if not serializer.is_valid():
+        return APIResponse.get_validation_error_response(
+            return_code=APIResponse.Codes.VALIDATION_ERROR,
+            serializer_errors=serializer.errors
+        )
+
+    export_type = serializer.validated_data['type']
+    rows = User.objects.order_by('pk').values(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    if export_type == 'csv':
+        lines, content_type = csv_lines(rows, EXPORT_FIELDS), 'text/csv'
+    else:
+        lines, content_type = ndjson_lines(rows), 'application/x-ndjson'
+
+    response = StreamingHttpResponse(buffered(lines), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="users.{export_type}"'
+    return response
+
+
 # Add a new user (Admin only)
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 @parser_classes([MultiPartParser, FormParser, JSONParser])  # Support file uploads
-@transaction.atomic
 def adduser(request):
 
     serializer = RegistrationSerializer(data=request.data)  # Get user data with validation
@@ -65,10 +201,10 @@ def adduser(request):
             serializer_errors=serializer.errors
         )
     
-    user = serializer.save()  # Create user
+    user = save_user_serializer(serializer)  # Create user
     # Admin created users are automatically verified
     user.is_verified = True
-    user.save()
+    save_user(user)
     
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.REGISTRATION_SUCCESS,
@@ -81,7 +217,6 @@ def adduser(request):
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAdminUser])
 @parser_classes([MultiPartParser, FormParser, JSONParser])  # Support file uploads
-@transaction.atomic
 def edituser(request, pk):
 
 
@@ -102,13 +237,11 @@ def edituser(request, pk):
             serializer_errors=serializer.errors
         )
     
+    # If password is provided, hash it now; the serializer's save writes it together with the other fields
     password = serializer.validated_data.pop('password', None)
-    serializer.save()
-
-    # If password is provided, update it separately
     if password:
         user.set_password(password)
-        user.save()
+    save_user_serializer(serializer)
 
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.PROFILE_UPDATED,
@@ -119,7 +252,6 @@ def edituser(request, pk):
 # Update password (Admin only)
 @api_view(['PUT'])
 @permission_classes([IsAdminUser])
-@transaction.atomic
 def update_password(request, pk):
 
     
@@ -143,7 +275,7 @@ def update_password(request, pk):
 
     # Hash and save the new password
     user.set_password(new_password)
-    user.save()
+    save_user(user)
 
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.PASSWORD_CHANGE_SUCCESS,
@@ -154,6 +286,7 @@ def update_password(request, pk):
 # Delete user (Admin only)
 @api_view(['DELETE'])
 @permission_classes([IsAdminUser])
+@sqlite_write
 @transaction.atomic
 def del_user(request, pk):
     try:
@@ -175,7 +308,6 @@ def del_user(request, pk):
 @api_view(['POST'])
 @permission_classes([AllowAny]) 
 @parser_classes([MultiPartParser, FormParser, JSONParser])  # Support file uploads
-@transaction.atomic
 def sign_up(request):
     serializer = RegistrationSerializer(data=request.data)
     
@@ -185,8 +317,8 @@ def sign_up(request):
             serializer_errors=serializer.errors
         )
     
-    user = serializer.save()  # Create user (is_verified defaults to False)
-    send_otp(user)
+    user = save_user_serializer(serializer)  # Create user (is_verified defaults to False)
+    send_otp(user)  # After the user is committed, so the email is never sent twice by a retried write
     
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.REGISTRATION_SUCCESS,
@@ -199,6 +331,7 @@ def sign_up(request):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 @authentication_classes([])
+@sqlite_write
 @transaction.atomic
 def verify_email(request):
     serializer = VerifyEmailSerializer(data=request.data)
@@ -223,7 +356,7 @@ def verify_email(request):
         )
     
     # Check if OTP is expired (10 minutes)
-    if timezone.now() - otp_obj.created_at > timedelta(minutes=10):
+    if timezone.now() - otp_obj.created_at > OTP_VALIDITY:
         otp_obj.delete()
         return APIResponse.get_error_response(
             return_code=APIResponse.Codes.OTP_EXPIRED,
@@ -309,12 +442,29 @@ def sign_out(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def view_profile(request):
+    query = SparseFieldsQuerySerializer(data=request.query_params, context={'allowed_fields': PROFILE_READ_FIELDS})
+
+    if not query.is_valid():
+        return APIResponse.get_validation_error_response(
+            return_code=APIResponse.Codes.VALIDATION_ERROR,
+            serializer_errors=query.errors
+        )
+
     user = request.user
-    serializer = UserProfileSerializer(user)
+    # Serialized payload is cached per user and rebuilt only after the profile changes. A rebuild
+    # re-reads the row: request.user was loaded before the revision was read, so it may predate it.
+    profile = profile_cache.get_or_build(
+        user.pk, lambda: UserProfileSerializer(User.objects.filter(pk=user.pk).first() or user).data
+    )
+
+    # The payload is cached, so ?fields= only trims it
+    fields = query.validated_data.get('fields')
+    if fields:
+        profile = {field_name: profile[field_name] for field_name in fields}
     
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.PROFILE_RETRIEVED,
-        data={'user': serializer.data},
+        data={'user': profile},
         status_code=status.HTTP_200_OK
     )
 
@@ -322,7 +472,6 @@ def view_profile(request):
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser, JSONParser])
-@transaction.atomic
 def edit_profile(request):
     user = request.user
     serializer = EditProfileSerializer(user, data=request.data, partial=True)
@@ -333,7 +482,7 @@ def edit_profile(request):
             serializer_errors=serializer.errors
         )
     
-    updated_user = serializer.save()
+    updated_user = save_user_serializer(serializer)
     
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.PROFILE_UPDATED,
@@ -344,7 +493,6 @@ def edit_profile(request):
 # Change password (requires old password)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
-@transaction.atomic
 def change_password(request):
     serializer = ChangePasswordSerializer(data=request.data)
     
@@ -374,7 +522,7 @@ def change_password(request):
     
     # Update password
     user.set_password(new_password)
-    user.save()
+    save_user(user)
     
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.PASSWORD_CHANGE_SUCCESS,
@@ -429,7 +577,7 @@ def forget_password(request):
     from_email = settings.EMAIL_HOST_USER
     
     try:
-        send_mail(subject, message, from_email, [email], fail_silently=False)  # Send email
+        mailer.send_mail(subject, message, from_email, [email]).result(timeout=MAILER_SEND_TIMEOUT)  # Send email
     except Exception as e:
         return create_response(
             success=False,
@@ -448,7 +596,6 @@ def forget_password(request):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 @authentication_classes([])
-@transaction.atomic
 def reset_password(request,pk):
 
     serializer = ResetPasswordSerializer(data=request.data)
@@ -484,19 +631,16 @@ def reset_password(request,pk):
         )
     
     # Check if OTP is expired (10 minutes)
-    if timezone.now() - otp_obj.created_at > timedelta(minutes=10):
-        otp_obj.delete()
+    if timezone.now() - otp_obj.created_at > OTP_VALIDITY:
+        delete_otp(otp_obj)
         return APIResponse.get_error_response(
             return_code=APIResponse.Codes.OTP_EXPIRED,
             status_code=status.HTTP_400_BAD_REQUEST
         )
     
-    # Update user's password
+    # Update user's password and delete the OTP after use
     user.set_password(new_password)
-    user.save()
-
-    # Delete OTP after use
-    otp_obj.delete()
+    save_user(user, used_otp=otp_obj)
     
     return APIResponse.get_success_response(
         return_code=APIResponse.Codes.PASSWORD_CHANGE_SUCCESS,
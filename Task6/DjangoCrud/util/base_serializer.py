@@ -32,7 +32,11 @@ def get_response_serializer(
 
 class BaseModelSerializer(serializers.ModelSerializer):
     def __init__(self, *args, **kwargs):
+        only_fields = kwargs.pop("only_fields", None)  # Optional subset of fields to keep (sparse fieldsets)
         super(BaseModelSerializer, self).__init__(*args, **kwargs)
+        if only_fields is not None:
+            for field_name in set(self.fields) - set(only_fields):
+                self.fields.pop(field_name)
         for field_name, field in self.fields.items():
             field.error_messages = get_error_messages_code(field_name)
 
@@ -67,6 +71,15 @@ def get_crud_serializer(model: models.Model, fields: list = [], update=True):
     return BaseCrudSerializer
 
 
+def get_readable_fields(serializer_class) -> List[str]:
+    """Names of the fields a serializer outputs, in declaration order (write-only fields excluded)."""
+    return [
+        field_name
+        for field_name, field in serializer_class().fields.items()
+        if not field.write_only
+    ]
+
+
 class BaseSerializerSerializer(serializers.Serializer):
     def __init__(self, *args, **kwargs):
         super(BaseSerializerSerializer, self).__init__(*args, **kwargs)
@@ -81,11 +94,14 @@ def get_error_messages_code(field_name: str = None, extra_kwargs_fields: list =
             "required": f"{field_name}_required",
             "blank": f"{field_name}_blank",
             "invalid": f"{field_name}_invalid",
+            "invalid_choice": f"{field_name}_invalid",
             "does_not_exist": f"{field_name}_does_not_exist",
             "incorrect_type": f"{field_name}_invalid",
             "min_value": f"{field_name}_min_value",
             "max_value": f"{field_name}_max_value",
             "max_length": f"{field_name}_max_length",
+            "not_a_list": f"{field_name}_invalid",
+            "empty": f"{field_name}_blank",
         }
     elif extra_kwargs_fields:
         return {
@@ -0,0 +1,54 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FLUSH_SIZE = 64 * 1024  # Characters buffered before a chunk is handed to the server
+
+
+# JSON encoder for exported rows; values Django does not know (e.g. PhoneNumber) are written as strings
+class ExportJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+# File-like object whose write() just returns the value, so csv.writer can produce one line at a time
+class Echo:
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(rows):
+    encoder = ExportJSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def csv_lines(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+# Group encoded lines into chunks of about EXPORT_FLUSH_SIZE; the first line is sent on its own so the
+# client starts receiving data before the database has produced a whole chunk
+def buffered(lines, flush_size=EXPORT_FLUSH_SIZE):
+    buffer = []
+    size = 0
+    first = True
+    for line in lines:
+        if first:
+            yield line
+            first = False
+            continue
+        buffer.append(line)
+        size += len(line)
+        if size >= flush_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
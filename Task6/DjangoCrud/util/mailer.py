@@ -0,0 +1,214 @@
+import queue  # Pending messages shared by the connection workers
+import threading
+import time
+from concurrent.futures import Future  # Lets callers wait for (and see errors of) their own message
+from smtplib import SMTPConnectError, SMTPException, SMTPServerDisconnected
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+MAILER_POOL_SIZE = getattr(settings, 'MAILER_POOL_SIZE', 2)  # Number of long-lived SMTP connections
+MAILER_BATCH_SIZE = getattr(settings, 'MAILER_BATCH_SIZE', 50)  # Max messages a worker takes from the queue at once
+MAILER_FLUSH_INTERVAL = getattr(settings, 'MAILER_FLUSH_INTERVAL', 0.05)  # Seconds to wait for more messages before sending
+MAILER_IDLE_TIMEOUT = getattr(settings, 'MAILER_IDLE_TIMEOUT', 60)  # Close a connection unused for this many seconds
+MAILER_SEND_TIMEOUT = getattr(settings, 'MAILER_SEND_TIMEOUT', 30)  # Seconds send_mail() callers wait for delivery
+
+
+# True for errors that leave the SMTP connection unusable. SMTPException is itself an OSError, but
+# apart from these the server answered and the session can go on.
+def dropped(exc):
+    if isinstance(exc, (SMTPServerDisconnected, SMTPConnectError)):
+        return True
+    return isinstance(exc, OSError) and not isinstance(exc, SMTPException)
+
+
+# Per-connection counters, read through PooledMailer.metrics()
+class ConnectionMetrics:
+    def __init__(self, index):
+        self.index = index
+        self.sent = 0
+        self.batches = 0
+        self.failures = 0
+        self.reconnects = 0
+        self.busy_seconds = 0.0
+
+    def as_dict(self):
+        return {
+            'connection': self.index,
+            'sent': self.sent,
+            'batches': self.batches,
+            'failures': self.failures,
+            'reconnects': self.reconnects,
+            'busy_seconds': round(self.busy_seconds, 6),
+            'messages_per_second': round(self.sent / self.busy_seconds, 2) if self.busy_seconds else 0.0,
+        }
+
+
+# Sends mail over a small pool of authenticated connections instead of one TLS handshake per message.
+# Each worker thread owns one connection obtained from get_connection(), drains up to MAILER_BATCH_SIZE
+# queued messages and sends them one by one over that connection, so every message gets its own
+# result: a refused recipient or a bad header only fails that message's future. When the connection
+# drops, the message is retried once on a fresh connection, unless the drop came after the DATA
+# command was sent, where the server may already have accepted it (no duplicates).
+class PooledMailer:
+    def __init__(self, pool_size=MAILER_POOL_SIZE, batch_size=MAILER_BATCH_SIZE,
+                 flush_interval=MAILER_FLUSH_INTERVAL, idle_timeout=MAILER_IDLE_TIMEOUT, backend=None):
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.idle_timeout = idle_timeout
+        self.backend = backend  # None means settings.EMAIL_BACKEND
+        self._queue = queue.Queue()
+        self._workers = []
+        self._metrics = []
+        self._start_lock = threading.Lock()
+
+    # Start the workers, or replace any that died
+    def _start(self):
+        with self._start_lock:
+            for index in range(self.pool_size):
+                if index < len(self._workers) and self._workers[index].is_alive():
+                    continue
+                if index == len(self._metrics):
+                    self._metrics.append(ConnectionMetrics(index))
+                worker = threading.Thread(
+                    target=self._run, args=(self._metrics[index],), name=f"mailer-{index}", daemon=True
+                )
+                if index < len(self._workers):
+                    self._workers[index] = worker
+                else:
+                    self._workers.append(worker)
+                worker.start()
+
+    # Queue an EmailMessage; the returned Future resolves to the number sent or raises the sending error
+    def send(self, message):
+        if len(self._workers) < self.pool_size or not all(worker.is_alive() for worker in self._workers):
+            self._start()
+        future = Future()
+        self._queue.put((message, future))
+        return future
+
+    # Same arguments as django.core.mail.send_mail, but delivered through the pool
+    def send_mail(self, subject, message, from_email, recipient_list):
+        return self.send(EmailMessage(subject, message, from_email, recipient_list))
+
+    def metrics(self):
+        return [metrics.as_dict() for metrics in self._metrics]
+
+    # Stop the workers after they drain the queue and close their connections
+    def close(self):
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        self._metrics = []
+
+    def _next_batch(self):
+        try:
+            item = self._queue.get(timeout=self.idle_timeout)
+        except queue.Empty:
+            return []
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while item is not None and len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self, metrics):
+        connection = None
+        while True:
+            batch = self._next_batch()
+            stop = None in batch
+            batch = [item for item in batch if item is not None]
+
+            if not batch:
+                # Idle (or shutting down): release the connection, it is reopened on the next batch
+                connection = self._close(connection)
+                if stop:
+                    return
+                continue
+
+            started = time.monotonic()
+            try:
+                connection = self._send_batch(connection, batch, metrics)
+            except Exception as exc:
+                # Unexpected error: this worker's connection is suspect, and no caller may be left waiting
+                connection = self._close(connection)
+                for _, future in batch:
+                    if not future.done():
+                        metrics.failures += 1
+                        future.set_exception(exc)
+            finally:
+                metrics.batches += 1
+                metrics.busy_seconds += time.monotonic() - started
+
+            if stop:
+                self._close(connection)
+                return
+
+    # Sends the batch one message at a time and settles each message's future. Returns the connection
+    # to use for the next batch (None once it has been dropped).
+    def _send_batch(self, connection, batch, metrics):
+        for message, future in batch:
+            for attempt in range(2):
+                try:
+                    if connection is None:
+                        connection = self._open()
+                    connection.data_sent = False
+                    connection.send_messages([message])
+                except Exception as exc:
+                    if not dropped(exc):
+                        # Refused sender/recipients, rejected data or a message that cannot be built:
+                        # smtplib has reset the session, so the connection is still good for the rest
+                        metrics.failures += 1
+                        future.set_exception(exc)
+                        break
+                    # Dropped or timed-out connection: the next message needs a new one either way. Only
+                    # retry this one if the server cannot have accepted it yet.
+                    after_data = getattr(connection, 'data_sent', False)
+                    connection = self._close(connection)
+                    if attempt or after_data:
+                        metrics.failures += 1
+                        future.set_exception(exc)
+                        break
+                    metrics.reconnects += 1
+                else:
+                    metrics.sent += 1
+                    future.set_result(1)
+                    break
+        return connection
+
+    def _open(self):
+        connection = get_connection(self.backend, fail_silently=False)
+        connection.open()  # Opened explicitly so send_messages() leaves it open for the next message
+        connection.data_sent = False
+        smtp = getattr(connection, 'connection', None)  # The smtplib.SMTP of the SMTP backend
+        if smtp is not None:
+            # Remember when DATA goes out: after that a dropped connection may still have delivered
+            data = smtp.data
+
+            def tracked_data(msg):
+                connection.data_sent = True
+                return data(msg)
+
+            smtp.data = tracked_data
+        return connection
+
+    def _close(self, connection):
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        return None
+
+
+mailer = PooledMailer()  # Process-wide pool used by the OTP and password reset emails
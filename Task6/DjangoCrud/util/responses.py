@@ -20,6 +20,10 @@ class APIResponse:
         PROFILE_RETRIEVED = "PROFILE_RETRIEVED"
         PROFILE_UPDATED = "PROFILE_UPDATED"
         USERS_LIST_RETRIEVED = "USERS_LIST_RETRIEVED"
+        USER_CHANGES_RETRIEVED = "USER_CHANGES_RETRIEVED"
+        INVOICES_EXTRACTED = "INVOICES_EXTRACTED"
+        INVOICE_JOB_CREATED = "INVOICE_JOB_CREATED"
+        INVOICE_JOB_RETRIEVED = "INVOICE_JOB_RETRIEVED"
 
         # -------------------------
         # ERROR CODES
@@ -45,6 +49,8 @@ class APIResponse:
         USER_DELETED = "USER_DELETED"
         EMAIL_ALREADY_EXISTS = "EMAIL_ALREADY_EXISTS"
         PASSWORD_LENGTH_INVALID = "PASSWORD_LENGTH_INVALID"
+        INVOICE_JOB_NOT_FOUND = "INVOICE_JOB_NOT_FOUND"
+        INVOICE_EXTRACTION_FAILED = "INVOICE_EXTRACTION_FAILED"
 
         # -------------------------
         # SUCCESS MESSAGES
@@ -61,6 +67,10 @@ class APIResponse:
             PROFILE_RETRIEVED: "Profile retrieved successfully.",
             PROFILE_UPDATED: "Profile updated successfully.",
             USERS_LIST_RETRIEVED: "Users list retrieved successfully.",
+            USER_CHANGES_RETRIEVED: "User changes retrieved successfully.",
+            INVOICES_EXTRACTED: "Invoice fields extracted successfully.",
+            INVOICE_JOB_CREATED: "Extraction job created. Poll the job for results.",
+            INVOICE_JOB_RETRIEVED: "Extraction job retrieved successfully.",
         }
 
         # -------------------------
@@ -88,6 +98,8 @@ class APIResponse:
             USER_DELETED: "User account deleted.",
             EMAIL_ALREADY_EXISTS: "Email already exists.",
             PASSWORD_LENGTH_INVALID: "Password must be 8-16 characters long and contain at least one number and one special character.",
+            INVOICE_JOB_NOT_FOUND: "Extraction job not found.",
+            INVOICE_EXTRACTION_FAILED: "Invoice extraction failed, please try again.",
         }
 
     # --------------------------------------------------------
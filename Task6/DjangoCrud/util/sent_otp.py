@@ -1,29 +1,56 @@
 import random
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
+from .mailer import mailer, MAILER_SEND_TIMEOUT
+from django.db import transaction
 from django.utils import timezone
 from usermangement.models import EmailVerificationOTP
 from django.conf import settings
 from .responses import create_response
 from .responses import status
+from .sqlite_writes import sqlite_write
 
-# Utility function to send OTP email because it was used twice in main views.py so for code reusability i have added this in the util 
-def send_otp(user):
+# Generate a random 6-digit OTP
+def generate_otp():
+    return f"{random.randint(100000, 999999)}"
+
+
+# Build the email verification message for a user and OTP
+def otp_email(user, otp):
+    subject = "Email Verification OTP"
+    message = f"Welcome {user.first_name}! Your email verification OTP is: {otp}. It is valid for 10 minutes."
+    return EmailMessage(subject, message, settings.EMAIL_HOST_USER, [user.email])
+
+
+# Store a new OTP for the user in a short write transaction and return it
+@sqlite_write
+@transaction.atomic
+def save_otp(user):
     # Generate 6-digit OTP for email verification
-    otp = f"{random.randint(100000, 999999)}"
+    otp = generate_otp()
     EmailVerificationOTP.objects.update_or_create(
         user=user, 
         defaults={'otp': otp, 'created_at': timezone.now()}
     )
-    # Send OTP to user's email
-    subject = "Email Verification OTP"
-    message = f"Welcome {user.first_name}! Your email verification OTP is: {otp}. It is valid for 10 minutes."
-    from_email = settings.EMAIL_HOST_USER
+    return otp
+
+
+@sqlite_write
+@transaction.atomic
+def delete_user(user):
+    user.delete()
+
+
+# Utility function to send OTP email because it was used twice in main views.py so for code reusability i have added this in the util 
+# Call it outside write transactions: waiting for the email must not hold (or be repeated by) a database write
+def send_otp(user):
+    otp = save_otp(user)
     
     try:
-        send_mail(subject, message, from_email, [user.email], fail_silently=False)
+        # Delivered over the pooled SMTP connections; result() re-raises any sending error
+        mailer.send(otp_email(user, otp)).result(timeout=MAILER_SEND_TIMEOUT)
     except Exception as e:
         # If email fails, delete the user and return error
-        user.delete()
+        delete_user(user)
         return create_response(
             success=False,
             message='Failed to send verification email',
@@ -0,0 +1,93 @@
+import functools
+import queue
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import OperationalError, connection
+
+SQLITE_BUSY_RETRIES = getattr(settings, 'SQLITE_BUSY_RETRIES', 5)  # Extra attempts after a "database is locked" error
+SQLITE_BUSY_BACKOFF = getattr(settings, 'SQLITE_BUSY_BACKOFF', 0.05)  # Base backoff in seconds, doubled per attempt
+SQLITE_SERIALIZED_WRITES = getattr(settings, 'SQLITE_SERIALIZED_WRITES', False)  # Funnel writes through one connection
+
+BUSY_MESSAGES = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def is_busy_error(exc):
+    return isinstance(exc, (OperationalError, sqlite3.OperationalError)) and any(
+        message in str(exc).lower() for message in BUSY_MESSAGES
+    )
+
+
+# Re-run a write transaction when SQLite reports the database as locked, sleeping a random
+# ("full jitter") share of an exponentially growing backoff so retrying writers spread out.
+# Only the outermost transaction is retried; inside an enclosing atomic block the error is re-raised.
+def retry_on_busy(func=None, *, retries=SQLITE_BUSY_RETRIES, backoff=SQLITE_BUSY_BACKOFF):
+    if func is None:
+        return functools.partial(retry_on_busy, retries=retries, backoff=backoff)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:
+                if attempt == retries or connection.in_atomic_block or not is_busy_error(exc):
+                    raise
+                time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+    return wrapper
+
+
+# Runs submitted write transactions one at a time on a dedicated thread. Django gives that thread its
+# own connection, so all writes of this process go through a single connection and never contend
+# with each other for the SQLite write lock.
+class WriteQueue:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, func, *args, **kwargs):
+        if self._thread is None:
+            self._start()
+        future = Future()
+        self._queue.put((func, args, kwargs, future))
+        return future
+
+    def _run(self):
+        while True:
+            func, args, kwargs, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(retry_on_busy(func)(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+
+write_queue = WriteQueue()  # Process-wide single writer used when SQLITE_SERIALIZED_WRITES is on
+
+
+# Decorator for short write transactions (put it above @transaction.atomic).
+# Retries busy errors with jittered backoff or, with SQLITE_SERIALIZED_WRITES, hands the call to the
+# single writer thread and waits for its result.
+def sqlite_write(func):
+    retrying = retry_on_busy(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if SQLITE_SERIALIZED_WRITES and not connection.in_atomic_block:
+            return write_queue.submit(func, *args, **kwargs).result()
+        return retrying(*args, **kwargs)
+
+    return wrapper